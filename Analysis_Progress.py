@@ -0,0 +1,78 @@
+import time
+from collections import namedtuple
+
+ProgressReport = namedtuple("ProgressReport", [
+    "frames_done",     # Frames decoded so far (analyzed, dropped or skipped)
+    "total_frames",    # Frame count from the container, 0 if it did not report one
+    "percent",         # 0-100, None without a frame count
+    "fps",             # Recent analysis rate in frames per second, None if nothing was timed
+    "eta_seconds",     # Estimated time left, None without a frame count or rate
+    "frames_dropped",  # Frames lost because analysis fell behind
+    "frames_skipped",  # Frames decoded after a confirmed landing and left unanalyzed on purpose
+    "elapsed_seconds",
+    "finished"
+])
+
+
+class ProgressTracker:
+    """Turns a per-frame counter into throttled progress reports.
+
+    The frame count is read once by the caller and passed in, so tracking a
+    frame is a counter increment and a clock read; on_report is only called
+    every interval seconds (and once more from finish()), which keeps GUI
+    updates cheap however fast the frames go by.
+    """
+
+    def __init__(self, total_frames, on_report, interval=0.25):
+        self.total_frames = max(0, int(total_frames or 0))
+        self.on_report = on_report
+        self.interval = interval
+        self.frames_done = 0
+        self.frames_dropped = 0
+        self.frames_skipped = 0
+        self.fps = 0.0
+        self.start_time = time.perf_counter()
+        self._last_time = self.start_time
+        self._last_frames = 0
+
+    def frame_done(self, dropped=False, skipped=False):
+        """Count one decoded frame and report if the interval has elapsed"""
+        self.frames_done += 1
+        if dropped:
+            self.frames_dropped += 1
+        elif skipped:
+            self.frames_skipped += 1
+        now = time.perf_counter()
+        if now - self._last_time >= self.interval:
+            self._report(now, False)
+
+    def finish(self, timed=True):
+        """Send the final report.
+
+        Pass timed=False when the frames were not actually analyzed (e.g. a
+        landmark cache hit); the report then has no rate instead of a
+        meaningless one.
+        """
+        self._report(time.perf_counter(), True, timed)
+
+    def _report(self, now, finished, timed=True):
+        window = now - self._last_time
+        if not timed:
+            self.fps = None
+        elif finished and now > self.start_time:
+            self.fps = self.frames_done / (now - self.start_time)  # Overall rate for the summary
+        elif window > 0:
+            rate = (self.frames_done - self._last_frames) / window
+            # Smooth over a few windows so the ETA does not jitter
+            self.fps = rate if self._last_frames == 0 else 0.5 * self.fps + 0.5 * rate
+        self._last_time = now
+        self._last_frames = self.frames_done
+
+        percent = eta = None
+        if self.total_frames:
+            done = self.total_frames if finished else min(self.frames_done, self.total_frames)
+            percent = done * 100 / self.total_frames
+            eta = 0.0 if finished else ((self.total_frames - done) / self.fps if self.fps > 0 else None)
+        self.on_report(ProgressReport(self.frames_done, self.total_frames, percent, self.fps, eta,
+                                      self.frames_dropped, self.frames_skipped, now - self.start_time,
+                                      finished))
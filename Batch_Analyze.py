@@ -0,0 +1,317 @@
+"""Headless batch analysis of jump videos.
+
+Example:
+    python Batch_Analyze.py clips/ "testing_day/*.mov" -o results.jsonl --email athlete@example.com
+"""
+import argparse
+import csv
+import glob
+import json
+import multiprocessing
+import os
+import sys
+import time
+from Jump_Database import JumpDatabase
+from Landmark_Cache import DEFAULT_CACHE_DIR
+
+VIDEO_EXTENSIONS = (".mp4", ".avi", ".mov")
+RESULT_FIELDS = ["video", "jump_index", "jump_height_inches", "jump_height_meters", "flight_time",
+                 "takeoff_frame", "landing_frame", "fps", "frame_count", "com_samples",
+                 "analysis_seconds", "frames_per_second", "error"]
+BENCHMARK_FIELDS = ["video", "inference_scale", "frame_count", "analysis_seconds",
+                    "frames_per_second", "jump_height_inches", "drift_inches", "error"]
+
+_analyzer = None  # One long-lived JumpAnalyzer (and Pose graph) per worker process
+_stop_at_landing = False
+_multi_jump = False
+
+
+def find_videos(inputs):
+    """Expand directories, globs and plain paths into a sorted list of video files"""
+    videos = set()
+    for item in inputs:
+        if os.path.isdir(item):
+            for root, _, files in os.walk(item):
+                videos.update(
+                    os.path.join(root, name) for name in files
+                    if name.lower().endswith(VIDEO_EXTENSIONS)
+                )
+        else:
+            matches = glob.glob(item, recursive=True) or [item]
+            videos.update(path for path in matches if os.path.isfile(path))
+    return sorted(videos)
+
+
+def _init_worker(analyzer_options, cache_dir, stop_at_landing, multi_jump):
+    global _analyzer, _stop_at_landing, _multi_jump
+    import cv2
+    from Jump_Analyzer import JumpAnalyzer
+    from Landmark_Cache import LandmarkCache
+
+    # Parallelism comes from the process pool, so keep OpenCV single threaded
+    cv2.setNumThreads(1)
+    landmark_cache = LandmarkCache(cache_dir) if cache_dir else None
+    _analyzer = JumpAnalyzer(landmark_cache=landmark_cache, **analyzer_options)
+    _stop_at_landing = stop_at_landing and not multi_jump
+    _multi_jump = multi_jump
+
+
+def _analyze_video(video_path):
+    """Analyze one video and return its result rows (one per jump with --multi-jump)"""
+    result = dict.fromkeys(RESULT_FIELDS)
+    result["video"] = video_path
+    start = time.perf_counter()
+    try:
+        # The Pose graph is reused across videos, so drop tracking from the last clip
+        _analyzer.reset_tracking()
+        trajectory = _analyzer.collect_trajectory(video_path, _stop_at_landing)
+        if trajectory is None:
+            result["error"] = "could not open video"
+            return [result]
+
+        com_positions, fps, frame_indices, frame_count = trajectory
+        jumps = None
+        if _multi_jump:
+            jumps = _analyzer.segment_jumps(com_positions, fps, frame_indices)
+        elif _stop_at_landing and _analyzer.detector.landed:
+            jump_height = _analyzer.detector.jump_height
+        else:
+            jump_height, _ = _analyzer.analyze_trajectory(com_positions, fps, frame_indices)
+        elapsed = time.perf_counter() - start
+
+        result.update(
+            fps=fps,
+            frame_count=frame_count,
+            com_samples=len(com_positions),
+            analysis_seconds=round(elapsed, 3),
+            frames_per_second=round(frame_count / elapsed, 2) if elapsed > 0 else None
+        )
+        if jumps is not None:
+            if not jumps:
+                result["error"] = "no jumps found"
+                return [result]
+            return [
+                dict(result,
+                     jump_index=jump_index,
+                     jump_height_meters=jump["jump_height"],
+                     jump_height_inches=jump["jump_height"] * 39.37,
+                     flight_time=jump["flight_time"],
+                     takeoff_frame=jump["takeoff_frame"],
+                     landing_frame=jump["landing_frame"])
+                for jump_index, jump in enumerate(jumps)
+            ]
+        if jump_height is None:
+            result["error"] = "not enough pose detections"
+        else:
+            result["jump_height_meters"] = jump_height
+            result["jump_height_inches"] = jump_height * 39.37
+    except Exception as e:
+        result["error"] = str(e)
+    return [result]
+
+
+def benchmark_resolutions(videos, scales, analyzer_options, writer):
+    """Analyze every video at each inference scale, without the landmark cache.
+
+    Reports throughput per run and the jump height drift relative to the
+    first scale given (normally 1.0, i.e. full resolution).
+    """
+    from Jump_Analyzer import JumpAnalyzer
+
+    runs = {}
+    for scale in scales:
+        options = dict(analyzer_options, inference_scale=scale, inference_height=None)
+        analyzer = JumpAnalyzer(**options)
+        try:
+            for video in videos:
+                analyzer.reset_tracking()
+                start = time.perf_counter()
+                trajectory = analyzer.collect_trajectory(video)
+                elapsed = time.perf_counter() - start
+                if trajectory is None:
+                    runs[scale, video] = (None, elapsed, None)
+                    continue
+                com_positions, fps, frame_indices, frame_count = trajectory
+                jump_height, _ = analyzer.analyze_trajectory(com_positions, fps, frame_indices)
+                runs[scale, video] = (frame_count, elapsed, jump_height)
+        finally:
+            analyzer.close()  # One Pose graph alive at a time
+
+    for scale in scales:
+        total_frames = total_seconds = 0
+        drifts = []
+        for video in videos:
+            frame_count, elapsed, jump_height = runs[scale, video]
+            reference = runs[scales[0], video][2]
+            row = dict.fromkeys(BENCHMARK_FIELDS)
+            row.update(video=video, inference_scale=scale, analysis_seconds=round(elapsed, 3))
+            if frame_count is None:
+                row["error"] = "could not open video"
+            elif jump_height is None:
+                row["error"] = "not enough pose detections"
+            else:
+                row["jump_height_inches"] = jump_height * 39.37
+                if reference is not None:
+                    row["drift_inches"] = (jump_height - reference) * 39.37
+                    drifts.append(abs(row["drift_inches"]))
+            if frame_count is not None:
+                row["frame_count"] = frame_count
+                row["frames_per_second"] = round(frame_count / elapsed, 2) if elapsed > 0 else None
+                total_frames += frame_count
+                total_seconds += elapsed
+            writer.write(row)
+
+        fps_text = f"{total_frames / total_seconds:.1f} fps" if total_seconds > 0 else "no frames"
+        drift_text = (f"mean |drift| {sum(drifts) / len(drifts):.2f} in, max {max(drifts):.2f} in"
+                      if drifts else "no drift data")
+        print(f"scale {scale:g}: {fps_text}, {drift_text}", file=sys.stderr)
+
+
+def open_database(db_path):
+    """Open db_path with its schema brought up to date, as the GUI does at startup"""
+    database = JumpDatabase(db_path)
+    try:
+        database.initialize()
+    except BaseException:
+        database.close()
+        raise
+    return database
+
+
+def lookup_height_inches(db_path, email):
+    """Stored height of a registered user (None if unset); exits if the user does not exist"""
+    database = open_database(db_path)
+    try:
+        if not database.user_exists(email):
+            raise SystemExit(f"No user with email {email} in {db_path}")
+        return database.get_height(email)
+    finally:
+        database.close()
+
+
+def save_results(db_path, email, results):
+    """Insert all successful results as jump_records rows in one transaction"""
+    heights = [result["jump_height_inches"] for result in results
+               if result["jump_height_inches"] is not None]
+    database = open_database(db_path)
+    try:
+        database.add_jumps(email, heights)
+    finally:
+        database.close()
+    return len(heights)
+
+
+class ResultWriter:
+    """Streams results to JSONL or CSV as they arrive"""
+
+    def __init__(self, path, output_format, fieldnames=RESULT_FIELDS):
+        self.file = sys.stdout if path == "-" else open(path, "w", newline="")
+        self.csv_writer = None
+        if output_format == "csv":
+            self.csv_writer = csv.DictWriter(self.file, fieldnames=fieldnames)
+            self.csv_writer.writeheader()
+
+    def write(self, result):
+        if self.csv_writer:
+            self.csv_writer.writerow(result)
+        else:
+            self.file.write(json.dumps(result) + "\n")
+        self.file.flush()
+
+    def close(self):
+        if self.file is not sys.stdout:
+            self.file.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Analyze folders of jump videos without the GUI.")
+    parser.add_argument("inputs", nargs="+", help="Video files, directories or glob patterns")
+    parser.add_argument("-o", "--output", default="-", help="Output file (default: stdout)")
+    parser.add_argument("--format", choices=["jsonl", "csv"],
+                        help="Output format (default: from the output extension, else jsonl)")
+    parser.add_argument("-j", "--workers", type=int, default=os.cpu_count(),
+                        help="Number of worker processes (default: all cores)")
+    parser.add_argument("--email", help="Save results to jump_records for this user")
+    parser.add_argument("--db", default="users.db", help="Database used with --email")
+    parser.add_argument("--height-inches", type=int,
+                        help="Athlete height (default: stored height for --email, else 72)")
+    parser.add_argument("--cache-dir", default=DEFAULT_CACHE_DIR,
+                        help="Landmark cache directory (default: %(default)s)")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="Always run Pose, without reading or writing the landmark cache")
+    parser.add_argument("--roi", action="store_true",
+                        help="Run Pose on a tracked crop around the athlete instead of the full frame")
+    parser.add_argument("--inference-scale", type=float, default=1.0,
+                        help="Downscale factor applied to frames before Pose (default: 1.0)")
+    parser.add_argument("--inference-height", type=int,
+                        help="Downscale frames to this height before Pose (overrides --inference-scale)")
+    parser.add_argument("--stop-at-landing", action="store_true",
+                        help="Stop decoding each video as soon as a landing is detected")
+    parser.add_argument("--multi-jump", action="store_true",
+                        help="Report every jump in each video (one row per jump)")
+    parser.add_argument("--benchmark", metavar="SCALES",
+                        help="Compare comma-separated inference scales, e.g. 1,0.5,0.25: report "
+                             "fps and height drift per scale instead of analyzing normally")
+    args = parser.parse_args(argv)
+
+    videos = find_videos(args.inputs)
+    if not videos:
+        parser.error("no videos found")
+
+    output_format = args.format or ("csv" if args.output.lower().endswith(".csv") else "jsonl")
+    height_inches = args.height_inches
+    if args.email:
+        # Check the user before analyzing; saving for an unknown email would only fail at the end
+        stored_height = lookup_height_inches(args.db, args.email)
+        if height_inches is None:
+            height_inches = stored_height
+    if height_inches is None:
+        height_inches = 72
+
+    analyzer_options = {
+        "person_height_meters": height_inches * 0.0254,
+        "roi_tracking": args.roi,
+        "inference_scale": args.inference_scale,
+        "inference_height": args.inference_height
+    }
+
+    if args.benchmark:
+        scales = [float(scale) for scale in args.benchmark.split(",")]
+        writer = ResultWriter(args.output, output_format, BENCHMARK_FIELDS)
+        try:
+            benchmark_resolutions(videos, scales, analyzer_options, writer)
+        finally:
+            writer.close()
+        return
+
+    workers = max(1, min(args.workers or 1, len(videos)))
+    print(f"Analyzing {len(videos)} videos with {workers} workers", file=sys.stderr)
+
+    writer = ResultWriter(args.output, output_format)
+    results = []
+    start = time.perf_counter()
+    try:
+        with multiprocessing.Pool(workers, initializer=_init_worker,
+                                  initargs=(analyzer_options,
+                                            None if args.no_cache else args.cache_dir,
+                                            args.stop_at_landing,
+                                            args.multi_jump)) as pool:
+            for done, video_results in enumerate(pool.imap_unordered(_analyze_video, videos), 1):
+                results.extend(video_results)
+                for result in video_results:
+                    writer.write(result)
+                summary = video_results[0]["error"] or ", ".join(
+                    format(result["jump_height_inches"], ".1f") for result in video_results) + " inches"
+                print(f"[{done}/{len(videos)}] {video_results[0]['video']}: {summary}", file=sys.stderr)
+    finally:
+        writer.close()
+
+    print(f"Finished in {time.perf_counter() - start:.1f}s", file=sys.stderr)
+
+    if args.email:
+        saved = save_results(args.db, args.email, results)
+        print(f"Saved {saved} jump records for {args.email}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
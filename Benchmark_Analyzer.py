@@ -0,0 +1,325 @@
+"""Offline microbenchmarks for the JumpAnalyzer hot paths.
+
+Pose is replaced by a fake that replays a landmark stream, so only the
+analyzer's own cost is measured and no camera or video is needed. The stream
+is synthetic by default, or a fixture recorded from a real video (or any
+landmark cache entry).
+
+Examples:
+    python Benchmark_Analyzer.py --save-baseline
+    python Benchmark_Analyzer.py                      # exits 1 on a regression
+    python Benchmark_Analyzer.py --record clip.mp4 --fixture clip_landmarks.npz
+    python Benchmark_Analyzer.py --fixture clip_landmarks.npz --baseline clip_baseline.json
+"""
+import argparse
+import json
+import os
+import sys
+import time
+import tracemalloc
+from types import SimpleNamespace
+import numpy as np
+
+DEFAULT_BASELINE = "benchmark_baseline.json"
+DEFAULT_TOLERANCE = 0.2  # Allowed relative slowdown / allocation growth
+RESULT_TOLERANCE = 1e-6  # Allowed relative change of the computed values
+
+# Offsets of the COM keypoints from the hips in normalized units (hips, shoulders, knees)
+_BODY_OFFSETS = {23: 0.0, 24: 0.0, 11: -0.15, 12: -0.15, 25: 0.15, 26: 0.15}
+
+
+def synthetic_com(fps=60.0, jumps=1, flight_time=0.5, standing_y=0.6, scale=1.0, seed=0):
+    """COM path (normalized y) of jumps with a known flight time, with small noise.
+
+    Each jump is one second of standing, a short countermovement, a ballistic
+    flight of flight_time seconds, a landing dip and another second of standing.
+    """
+    gravity = 9.81 / scale  # Normalized units per s²
+    t_stand, t_dip = int(fps), int(fps * 0.25)
+    pieces = []
+    for _ in range(jumps):
+        dip = 0.03 * np.sin(np.linspace(0, np.pi, t_dip))
+        t = np.arange(int(round(flight_time * fps))) / fps
+        flight = -(0.5 * gravity * flight_time * t - 0.5 * gravity * t ** 2)
+        pieces += [np.zeros(t_stand), dip, flight, dip]
+    pieces.append(np.zeros(t_stand))
+    com = standing_y + np.concatenate(pieces)
+    return com + np.random.default_rng(seed).normal(0, 0.0005, len(com))
+
+
+def synthetic_landmarks(com):
+    """(n, 33, 4) landmark array whose COM estimate follows com (normalized y)"""
+    n = len(com)
+    landmarks = np.zeros((n, 33, 4), dtype=np.float32)
+    landmarks[:, :, 0] = 0.5
+    landmarks[:, :, 1] = (com - 0.3)[:, np.newaxis]  # Head and hands above the COM keypoints
+    landmarks[:, :, 3] = 0.3
+    for index, offset in _BODY_OFFSETS.items():
+        landmarks[:, index, 1] = com + offset
+        landmarks[:, index, 3] = 0.95
+    return landmarks
+
+
+def load_fixture(path=None):
+    """Return (landmarks, frame_indices, frame_count, fps, image_height).
+
+    path is an .npz in the landmark cache format (see record_fixture); None
+    builds the synthetic one-jump stream.
+    """
+    if path is None:
+        landmarks = synthetic_landmarks(synthetic_com())
+        return landmarks, np.arange(len(landmarks)), len(landmarks), 60.0, 720
+    with np.load(path) as entry:
+        return (entry["landmarks"], entry["frame_indices"], int(entry["frame_count"]),
+                float(entry["fps"]), int(entry["image_height"]))
+
+
+def record_fixture(video_path, fixture_path, analyzer):
+    """Run the real Pose over a video once and save its landmarks as a fixture"""
+    import cv2
+
+    cap = cv2.VideoCapture(video_path)
+    if not cap.isOpened():
+        raise SystemExit(f"Could not open video: {video_path}")
+    landmarks, frame_indices = [], []
+    frame_count = image_height = 0
+    while True:
+        ret, frame = cap.read()
+        if not ret:
+            break
+        image_height = frame.shape[0]
+        pose_landmarks = analyzer.detect_pose(frame)
+        if pose_landmarks:
+            landmarks.append(analyzer.landmarks_to_array(pose_landmarks))
+            frame_indices.append(frame_count)
+        frame_count += 1
+    fps = cap.get(cv2.CAP_PROP_FPS)
+    cap.release()
+    np.savez_compressed(
+        fixture_path,
+        landmarks=np.asarray(landmarks, dtype=np.float32).reshape(-1, 33, 4),
+        frame_indices=np.asarray(frame_indices, dtype=np.int32),
+        frame_count=frame_count,
+        fps=fps,
+        image_height=image_height
+    )
+    print(f"Recorded {len(landmarks)} of {frame_count} frames to {fixture_path}", file=sys.stderr)
+
+
+class ReplayPose:
+    """Stands in for mediapipe's Pose and returns recorded landmarks frame after frame.
+
+    Frames without a recorded detection return no landmarks, like Pose does.
+    The stream starts over after the last frame or on reset().
+    """
+
+    def __init__(self, landmarks, frame_indices, frame_count):
+        from mediapipe.framework.formats import landmark_pb2
+
+        self.frames = [SimpleNamespace(pose_landmarks=None) for _ in range(frame_count)]
+        for frame_index, points in zip(frame_indices, landmarks):
+            landmark_list = landmark_pb2.NormalizedLandmarkList()
+            for x, y, z, visibility in points.tolist():
+                landmark_list.landmark.add(x=x, y=y, z=z, visibility=visibility)
+            self.frames[frame_index] = SimpleNamespace(pose_landmarks=landmark_list)
+        self.position = 0
+
+    def process(self, image):
+        result = self.frames[self.position]
+        self.position = (self.position + 1) % len(self.frames)
+        return result
+
+    def reset(self):
+        self.position = 0
+
+    def close(self):
+        pass
+
+
+def build_benchmarks(analyzer, fixture):
+    """Return {name: callable}; each callable does one operation and returns a checkable value"""
+    from Jump_Analyzer import JumpDetector, pad_trajectories
+
+    landmarks, frame_indices, frame_count, fps, image_height = fixture
+    if not len(landmarks):
+        raise SystemExit("The fixture has no pose detections to replay")
+    replay = ReplayPose(landmarks, frame_indices, frame_count)
+    analyzer.pose = replay
+    analyzer.roi_tracking = False
+
+    com = analyzer.estimate_center_of_mass_from_array(landmarks, image_height)
+    valid = ~np.isnan(com)
+    com_positions = com[valid].tolist()
+    com_frames = np.asarray(frame_indices)[valid].tolist()
+    sample_landmarks = next(frame.pose_landmarks for frame in replay.frames if frame.pose_landmarks).landmark
+
+    batch, lengths = pad_trajectories([com_positions] * 64)
+    batch_frames, _ = pad_trajectories([com_frames] * 64, fill_value=0)
+    batch_frames = batch_frames.astype(np.int64)
+
+    multi_com = synthetic_com(fps, jumps=5) * image_height
+    frame = np.zeros((image_height, image_height * 16 // 9, 3), dtype=np.uint8)
+
+    def frame_loop():
+        """Whole-stream frame loop: pose (replayed), COM and the streaming detector"""
+        replay.reset()
+        detector = JumpDetector(fps, analyzer.gravity)
+        for frame_index in range(frame_count):
+            pose_landmarks = analyzer.detect_pose(frame)
+            if pose_landmarks:
+                com_y = analyzer.estimate_center_of_mass(pose_landmarks.landmark, image_height)
+                if com_y is not None:
+                    detector.update(com_y, frame_index)
+        return detector.jump_height
+
+    def detector_stream():
+        detector = JumpDetector(fps, analyzer.gravity)
+        for com_y, frame_index in zip(com_positions, com_frames):
+            detector.update(com_y, frame_index)
+        return detector.jump_height
+
+    return {
+        "estimate_center_of_mass": lambda: float(
+            analyzer.estimate_center_of_mass(sample_landmarks, image_height)),
+        "estimate_center_of_mass_from_array": lambda: float(
+            np.nansum(analyzer.estimate_center_of_mass_from_array(landmarks, image_height))),
+        "calculate_flight_time": lambda: analyzer.calculate_flight_time(com_positions, fps, com_frames),
+        "calculate_flight_times_x64": lambda: float(
+            analyzer.calculate_flight_times(batch, lengths, fps, batch_frames).sum()),
+        "segment_jumps": lambda: sum(jump["jump_height"] for jump in analyzer.segment_jumps(multi_com, fps)),
+        "jump_detector_stream": detector_stream,
+        "frame_loop": frame_loop
+    }
+
+
+def measure(function, min_time=0.2, repeats=5, alloc_calls=20):
+    """Return (ops_per_sec, peak bytes allocated per call, result) of a zero-argument callable"""
+    result = function()  # Warm up caches and lazy imports
+
+    # Calibrate the loop count so one repeat takes about min_time
+    loops = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(loops):
+            function()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time / 4:
+            break
+        loops *= 4
+    loops = max(1, int(loops * min_time / elapsed))
+
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        for _ in range(loops):
+            function()
+        best = min(best, (time.perf_counter() - start) / loops)
+
+    # Measured separately: tracing slows every allocation down
+    tracemalloc.start()
+    try:
+        peaks = []
+        for _ in range(alloc_calls):
+            tracemalloc.reset_peak()
+            before, _ = tracemalloc.get_traced_memory()
+            function()
+            peaks.append(tracemalloc.get_traced_memory()[1] - before)
+    finally:
+        tracemalloc.stop()
+    return 1.0 / best, int(np.median(peaks)), result
+
+
+def compare(results, baseline, tolerance):
+    """Return a list of failure messages for results that drifted from the baseline"""
+    failures = []
+    for name, current in results.items():
+        reference = baseline.get(name)
+        if reference is None:
+            continue
+        if current["ops_per_sec"] < reference["ops_per_sec"] * (1 - tolerance):
+            failures.append(f"{name}: {current['ops_per_sec']:.1f} ops/s, "
+                            f"baseline {reference['ops_per_sec']:.1f} ops/s")
+        if current["alloc_bytes_per_call"] > reference["alloc_bytes_per_call"] * (1 + tolerance) + 1024:
+            failures.append(f"{name}: {current['alloc_bytes_per_call']} bytes/call, "
+                            f"baseline {reference['alloc_bytes_per_call']} bytes/call")
+        if reference.get("result") is not None and (
+                current["result"] is None
+                or abs(current["result"] - reference["result"]) > RESULT_TOLERANCE * max(1.0, abs(reference["result"]))):
+            failures.append(f"{name}: result {current['result']!r}, baseline {reference['result']!r}")
+    return failures
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark JumpAnalyzer hot paths with a replayed Pose.")
+    parser.add_argument("--fixture", help="Landmark fixture (.npz) to replay; default: synthetic jump")
+    parser.add_argument("--record", metavar="VIDEO", help="Record --fixture from this video with the real Pose")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="Baseline file (default: %(default)s)")
+    parser.add_argument("--save-baseline", action="store_true", help="Write the results as the new baseline")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE,
+                        help="Allowed relative slowdown and allocation growth (default: %(default)s)")
+    parser.add_argument("--min-time", type=float, default=0.2, help="Seconds per timing repeat")
+    parser.add_argument("--only", help="Comma-separated benchmark names to run")
+    parser.add_argument("-o", "--output", help="Also write the results as JSON to this file")
+    args = parser.parse_args(argv)
+
+    from Jump_Analyzer import JumpAnalyzer
+
+    if args.record:
+        if not args.fixture:
+            parser.error("--record needs --fixture to write to")
+        analyzer = JumpAnalyzer(1.8)
+        try:
+            record_fixture(args.record, args.fixture, analyzer)
+        finally:
+            analyzer.close()
+        return
+
+    # Pose is replayed, so the real model is never loaded
+    benchmarks = build_benchmarks(JumpAnalyzer(1.8, pose_graph=False), load_fixture(args.fixture))
+    if args.only:
+        names = args.only.split(",")
+        unknown = set(names) - set(benchmarks)
+        if unknown:
+            parser.error(f"unknown benchmarks: {', '.join(sorted(unknown))}")
+        benchmarks = {name: benchmarks[name] for name in names}
+
+    results = {}
+    for name, function in benchmarks.items():
+        ops_per_sec, alloc_bytes, result = measure(function, args.min_time)
+        results[name] = {
+            "ops_per_sec": round(ops_per_sec, 2),
+            "alloc_bytes_per_call": alloc_bytes,
+            "result": None if result is None else float(result)
+        }
+        print(f"{name:36s} {ops_per_sec:14,.1f} ops/s {alloc_bytes:12,d} B/call", file=sys.stderr)
+
+    report = {"fixture": args.fixture or "synthetic", "benchmarks": results}
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+
+    if args.save_baseline:
+        with open(args.baseline, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"Saved baseline to {args.baseline}", file=sys.stderr)
+        return
+
+    if not os.path.exists(args.baseline):
+        print(f"No baseline at {args.baseline}; run with --save-baseline to create one", file=sys.stderr)
+        return
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    if baseline.get("fixture") != report["fixture"]:
+        print(f"Baseline was recorded with fixture {baseline.get('fixture')}, not {report['fixture']}",
+              file=sys.stderr)
+        sys.exit(1)
+    failures = compare(results, baseline["benchmarks"], args.tolerance)
+    for failure in failures:
+        print(f"REGRESSION {failure}", file=sys.stderr)
+    if failures:
+        sys.exit(1)
+    print(f"All benchmarks within {args.tolerance:.0%} of {args.baseline}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,278 @@
+"""End-to-end throughput benchmark on synthetic jump videos.
+
+Renders clips of a simple figure jumping along a known ballistic path, runs
+them through the full analysis (headless analyze_jump and the GUI's
+VideoPipeline) and reports throughput, peak RSS and the height error against
+the ground truth as JSONL, one row per run. Every run gets a fresh process,
+so peak RSS is per run.
+
+Examples:
+    python Benchmark_Pipeline.py -o e2e.jsonl
+    python Benchmark_Pipeline.py --resolutions 1280x720 --lengths 4,8 --compare e2e.jsonl
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+import cv2
+import numpy as np
+from Batch_Analyze import ResultWriter
+
+GRAVITY = 9.81
+E2E_FIELDS = ["mode", "width", "height", "fps", "clip_seconds", "frame_count", "setup_seconds",
+              "wall_seconds", "frames_per_second", "peak_rss_mb", "true_height_inches",
+              "measured_height_inches", "error_inches", "error"]
+MODES = ("analyze_jump", "pipeline")
+FIGURE_HEIGHT = 0.5  # Share of the frame height; Pose misses much smaller figures
+DEFAULT_TOLERANCE = 0.2  # Allowed relative throughput drop with --compare
+
+BACKGROUND = (200, 200, 195)
+FLOOR = (90, 110, 90)
+SKIN = (140, 170, 210)
+SHIRT = (60, 60, 200)
+PANTS = (120, 60, 40)
+
+
+def draw_figure(image, center_x, ground_y, figure_height, lift=0.0, crouch=0.0):
+    """Draw a standing figure with its feet lift pixels above ground_y.
+
+    crouch (0-1) lowers the hips and bends the knees outwards while the feet
+    stay put. Returns the hip height in pixels, which is what the COM
+    estimate follows.
+    """
+    s = figure_height / 8.0  # Head heights
+    ankle_y = ground_y - lift - 0.1 * s
+    hip_y = ankle_y - 4 * s + crouch * 0.8 * s
+    knee_y = (hip_y + ankle_y) / 2
+    knee_out = crouch * 0.6 * s
+
+    def point(dx, y):
+        return int(round(center_x + dx * s)), int(round(y))
+
+    head = point(0, hip_y - 3.4 * s)
+    shoulders = point(-0.9, hip_y - 2.6 * s), point(0.9, hip_y - 2.6 * s)
+    hips = point(-0.5, hip_y), point(0.5, hip_y)
+    knees = ((hips[0][0] - int(knee_out), int(knee_y)), (hips[1][0] + int(knee_out), int(knee_y)))
+    ankles = point(-0.6, ankle_y), point(0.6, ankle_y)
+    elbows = point(-1.2, hip_y - 1.4 * s), point(1.2, hip_y - 1.4 * s)
+    wrists = point(-1.3, hip_y - 0.3 * s), point(1.3, hip_y - 0.3 * s)
+    width = max(2, int(s * 0.45))
+
+    cv2.fillConvexPoly(image, np.array([shoulders[0], shoulders[1], hips[1], hips[0]], np.int32), SHIRT)
+    for side in (0, 1):
+        for start, end, color, line_width in [
+            (hips[side], knees[side], PANTS, width * 2),
+            (knees[side], ankles[side], PANTS, int(width * 1.6)),
+            (shoulders[side], elbows[side], SHIRT, int(width * 1.4)),
+            (elbows[side], wrists[side], SKIN, width)
+        ]:
+            cv2.line(image, start, end, color, line_width, cv2.LINE_AA)
+        cv2.ellipse(image, (ankles[side][0], ankles[side][1] + int(s * 0.1)),
+                    (int(s * 0.4), int(s * 0.15)), 0, 0, 360, (30, 30, 30), -1)
+    cv2.line(image, point(0, hip_y - 2.8 * s), head, SKIN, width, cv2.LINE_AA)
+
+    # Pose needs a face to lock on to
+    cv2.ellipse(image, head, (int(s * 0.45), int(s * 0.55)), 0, 0, 360, SKIN, -1, cv2.LINE_AA)
+    cv2.ellipse(image, head, (int(s * 0.47), int(s * 0.57)), 0, 180, 360, (40, 50, 70), -1)
+    eye_x, eye_y = int(s * 0.18), int(s * 0.1)
+    for dx in (-eye_x, eye_x):
+        cv2.circle(image, (head[0] + dx, head[1] - eye_y), max(1, int(s * 0.07)), (40, 30, 30), -1)
+    cv2.line(image, (head[0], head[1] - eye_y // 2), (head[0], head[1] + int(s * 0.12)),
+             (100, 120, 160), max(1, int(s * 0.05)))
+    cv2.ellipse(image, (head[0], head[1] + int(s * 0.28)), (int(s * 0.15), int(s * 0.05)),
+                0, 0, 180, (60, 60, 140), max(1, int(s * 0.04)))
+    return hip_y
+
+
+def render_jump_video(path, width=1280, height=720, fps=30.0, clip_seconds=4.0, flight_time=0.5,
+                      person_height_meters=1.8):
+    """Write a clip of one countermovement jump and return its true height in meters.
+
+    The figure stands, dips for 0.3 s, leaves the ground for flight_time
+    seconds on a ballistic path scaled by its height in pixels, dips again on
+    landing and stands still for the rest of the clip; the jump is centered
+    in the clip. The true height is g * flight_time² / 8.
+    """
+    writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*"MJPG"), fps, (width, height))
+    if not writer.isOpened():
+        raise IOError(f"Could not write video: {path}")
+
+    figure_height = height * FIGURE_HEIGHT
+    pixels_per_meter = figure_height / person_height_meters
+    ground_y = height * 0.9
+    dip = 0.3
+    takeoff = clip_seconds / 2 - flight_time / 2
+    landing = takeoff + flight_time
+
+    background = np.full((height, width, 3), BACKGROUND, np.uint8)
+    background[int(ground_y):] = FLOOR
+    frame = np.empty_like(background)
+    for frame_index in range(int(round(clip_seconds * fps))):
+        t = frame_index / fps
+        lift = crouch = 0.0
+        if takeoff - dip <= t < takeoff:
+            crouch = np.sin((t - takeoff + dip) / dip * np.pi)
+        elif takeoff <= t < landing:
+            airborne = t - takeoff
+            lift = (GRAVITY * flight_time * airborne / 2 - GRAVITY * airborne ** 2 / 2) * pixels_per_meter
+        elif landing <= t < landing + dip:
+            crouch = np.sin((t - landing) / dip * np.pi)
+        frame[...] = background
+        draw_figure(frame, width / 2, ground_y, figure_height, lift, crouch)
+        writer.write(frame)
+    writer.release()
+    return GRAVITY * flight_time ** 2 / 8
+
+
+def peak_rss_mb():
+    """Peak resident set size of this process in MB, None where unsupported"""
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024  # Bytes on macOS, KB elsewhere
+
+
+def _run(task):
+    """Analyze one clip in this (fresh) process and return its result row"""
+    mode, video_path, row, person_height_meters = task
+    row = dict(row, mode=mode)
+    from Jump_Analyzer import JumpAnalyzer
+
+    start = time.perf_counter()
+    analyzer = JumpAnalyzer(person_height_meters)
+    row["setup_seconds"] = round(time.perf_counter() - start, 3)
+
+    start = time.perf_counter()
+    if mode == "analyze_jump":
+        jump_height, _ = analyzer.analyze_jump(video_path)
+    else:
+        jump_height = _run_pipeline(analyzer, video_path)
+    elapsed = time.perf_counter() - start
+
+    row["wall_seconds"] = round(elapsed, 3)
+    row["frames_per_second"] = round(row["frame_count"] / elapsed, 2) if elapsed > 0 else None
+    row["peak_rss_mb"] = peak_rss_mb() and round(peak_rss_mb(), 1)
+    if jump_height is None:
+        row["error"] = "no jump measured"
+    else:
+        row["measured_height_inches"] = round(jump_height * 39.37, 3)
+        row["error_inches"] = round(row["measured_height_inches"] - row["true_height_inches"], 3)
+    return row
+
+
+def _run_pipeline(analyzer, video_path):
+    """The GUI frame loop without Qt: VideoPipeline with an instantly acknowledged preview"""
+    from Video_Pipeline import VideoPipeline
+
+    outcome = {}
+
+    def finished(com_positions, fps, frame_indices, detected_height):
+        outcome["height"], _ = analyzer.analyze_trajectory(com_positions, fps, frame_indices)
+
+    def failed(error):
+        outcome["error"] = error
+
+    pipeline = VideoPipeline(analyzer, video_path, preview_size=(960, 540),
+                             preview_rate=10, on_frame=lambda frame: pipeline.frame_displayed(),
+                             on_finished=finished, on_error=failed)
+    pipeline.start()
+    pipeline.wait()
+    if "error" in outcome:
+        raise RuntimeError(outcome["error"])
+    return outcome.get("height")
+
+
+def compare_runs(rows, previous_path, tolerance):
+    """Print throughput and error changes against an earlier output; return the regressions"""
+    def key(row):
+        return row["mode"], row["width"], row["height"], row["fps"], row["clip_seconds"]
+
+    with open(previous_path) as f:
+        previous = {key(row): row for row in map(json.loads, f) if row.get("frames_per_second")}
+    regressions = []
+    for row in rows:
+        before = previous.get(key(row))
+        if before is None or not row.get("frames_per_second"):
+            continue
+        change = row["frames_per_second"] / before["frames_per_second"] - 1
+        print(f"{row['mode']:12s} {row['width']}x{row['height']} {row['clip_seconds']:g}s: "
+              f"{change:+.1%} fps, error {before.get('error_inches')} -> {row.get('error_inches')} in",
+              file=sys.stderr)
+        if change < -tolerance:
+            regressions.append(row)
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Measure end-to-end analysis throughput on synthetic jump videos.")
+    parser.add_argument("-o", "--output", default="-", help="JSONL output file (default: stdout)")
+    parser.add_argument("--resolutions", default="640x360,1280x720,1920x1080",
+                        help="Comma-separated WIDTHxHEIGHT list (default: %(default)s)")
+    parser.add_argument("--lengths", default="3,6", help="Comma-separated clip lengths in seconds (default: %(default)s)")
+    parser.add_argument("--fps", type=float, default=30.0, help="Clip frame rate (default: %(default)s)")
+    parser.add_argument("--flight-time", type=float, default=0.5, help="True flight time in seconds")
+    parser.add_argument("--modes", default=",".join(MODES), help="Comma-separated subset of " + ", ".join(MODES))
+    parser.add_argument("--video-dir", help="Keep the rendered clips here (default: a temporary directory)")
+    parser.add_argument("--compare", metavar="JSONL", help="Earlier output to compare against; exits 1 on a "
+                                                           "throughput drop beyond --tolerance")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE,
+                        help="Allowed relative throughput drop (default: %(default)s)")
+    args = parser.parse_args(argv)
+
+    modes = args.modes.split(",")
+    if set(modes) - set(MODES):
+        parser.error(f"unknown modes: {', '.join(sorted(set(modes) - set(MODES)))}")
+    resolutions = [tuple(int(value) for value in item.lower().split("x")) for item in args.resolutions.split(",")]
+    lengths = [float(value) for value in args.lengths.split(",")]
+    person_height_meters = 1.8
+
+    temp_dir = None
+    video_dir = args.video_dir
+    if video_dir is None:
+        temp_dir = tempfile.TemporaryDirectory()
+        video_dir = temp_dir.name
+    os.makedirs(video_dir, exist_ok=True)
+
+    tasks = []
+    for width, height in resolutions:
+        for clip_seconds in lengths:
+            video_path = os.path.join(video_dir, f"jump_{width}x{height}_{args.fps:g}fps_{clip_seconds:g}s.avi")
+            true_height = render_jump_video(video_path, width, height, args.fps, clip_seconds,
+                                            args.flight_time, person_height_meters)
+            row = dict.fromkeys(E2E_FIELDS)
+            row.update(width=width, height=height, fps=args.fps, clip_seconds=clip_seconds,
+                       frame_count=int(round(clip_seconds * args.fps)),
+                       true_height_inches=round(true_height * 39.37, 3))
+            tasks.extend((mode, video_path, row, person_height_meters) for mode in modes)
+
+    writer = ResultWriter(args.output, "jsonl", E2E_FIELDS)
+    rows = []
+    try:
+        # One fresh process per run keeps peak RSS and warm caches from leaking between runs
+        with multiprocessing.get_context("spawn").Pool(1, maxtasksperchild=1) as pool:
+            for row in pool.imap(_run, tasks):
+                rows.append(row)
+                writer.write(row)
+                summary = row["error"] or f"{row['frames_per_second']} fps, error {row['error_inches']:+.2f} in"
+                print(f"{row['mode']:12s} {row['width']}x{row['height']} {row['clip_seconds']:g}s: {summary}, "
+                      f"peak RSS {row['peak_rss_mb']} MB", file=sys.stderr)
+    finally:
+        writer.close()
+        if temp_dir is not None:
+            temp_dir.cleanup()
+
+    if args.compare:
+        regressions = compare_runs(rows, args.compare, args.tolerance)
+        if regressions:
+            print(f"{len(regressions)} runs slower than {args.compare} by more than {args.tolerance:.0%}",
+                  file=sys.stderr)
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
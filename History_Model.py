@@ -0,0 +1,150 @@
+import numpy as np
+from PyQt6.QtCore import QAbstractTableModel, QEvent, QModelIndex, QRectF, Qt, pyqtSignal
+from PyQt6.QtGui import QColor, QPainter
+from PyQt6.QtWidgets import QStyle, QStyledItemDelegate
+
+DATE_COLUMN, HEIGHT_COLUMN, DELETE_COLUMN = range(3)
+RECORD_ID_ROLE = Qt.ItemDataRole.UserRole
+
+
+class JumpHistoryModel(QAbstractTableModel):
+    """Jump records of one athlete, newest first, loaded a page at a time.
+
+    The view asks for more rows through canFetchMore/fetchMore as it scrolls,
+    and each page is a keyset query continuing from the last loaded row, so
+    opening the history costs one page however long it is.
+    """
+    HEADERS = ["Date", "Height (inches)", "Delete"]
+
+    def __init__(self, database, page_size=100, parent=None):
+        super().__init__(parent)
+        self.database = database
+        self.page_size = page_size
+        self.email = None
+        self.records = []  # (id, date, jump_height, ts), newest first
+        self.exhausted = True
+
+    def load(self, email):
+        """Show the history of email (None to clear); only the first page is read."""
+        self.beginResetModel()
+        self.email = email
+        self.records = []
+        self.exhausted = email is None
+        self.endResetModel()
+        if self.canFetchMore(QModelIndex()):
+            self.fetchMore(QModelIndex())
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.records)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.HEADERS)
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if orientation == Qt.Orientation.Horizontal and role == Qt.ItemDataRole.DisplayRole:
+            return self.HEADERS[section]
+        return None
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        record_id, date, height, _ = self.records[index.row()]
+        if role == RECORD_ID_ROLE:
+            return record_id
+        if role == Qt.ItemDataRole.DisplayRole:
+            if index.column() == DATE_COLUMN:
+                return date
+            if index.column() == HEIGHT_COLUMN:
+                try:
+                    return f"{float(height):.1f}"
+                except (ValueError, TypeError):
+                    return "N/A"
+        return None
+
+    def flags(self, index):
+        return Qt.ItemFlag.ItemIsEnabled | Qt.ItemFlag.ItemIsSelectable
+
+    def canFetchMore(self, parent):
+        return not parent.isValid() and not self.exhausted
+
+    def fetchMore(self, parent):
+        if parent.isValid() or self.exhausted:
+            return
+        before = (self.records[-1][3], self.records[-1][0]) if self.records else None
+        page = self.database.jump_page(self.email, before, self.page_size)
+        self.exhausted = len(page) < self.page_size
+        if page:
+            self.beginInsertRows(QModelIndex(), len(self.records), len(self.records) + len(page) - 1)
+            self.records.extend(page)
+            self.endInsertRows()
+
+    def prepend_records(self, records):
+        """Insert newly saved (id, date, jump_height, ts) records at the top"""
+        if not records:
+            return
+        self.beginInsertRows(QModelIndex(), 0, len(records) - 1)
+        self.records[:0] = sorted(records, key=lambda record: (record[3], record[0]), reverse=True)
+        self.endInsertRows()
+
+    def remove_record(self, record_id):
+        """Drop a record from the loaded rows, if it has been loaded"""
+        for row, record in enumerate(self.records):
+            if record[0] == record_id:
+                self.beginRemoveRows(QModelIndex(), row, row)
+                del self.records[row]
+                self.endRemoveRows()
+                return
+
+
+class DeleteButtonDelegate(QStyledItemDelegate):
+    """Paints a delete button in each row instead of creating a widget per row"""
+    delete_requested = pyqtSignal(int)  # Record id
+
+    def paint(self, painter, option, index):
+        hovered = bool(option.state & QStyle.StateFlag.State_MouseOver)
+        button = QRectF(option.rect).adjusted(6, 4, -6, -4)
+        painter.save()
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        painter.setPen(Qt.PenStyle.NoPen)
+        painter.setBrush(QColor("#3A80D2" if hovered else "#4A90E2"))
+        painter.drawRoundedRect(button, 4, 4)
+        painter.setPen(QColor("white"))
+        painter.drawText(button, Qt.AlignmentFlag.AlignCenter, "Delete")
+        painter.restore()
+
+    def editorEvent(self, event, model, option, index):
+        if (event.type() == QEvent.Type.MouseButtonRelease
+                and event.button() == Qt.MouseButton.LeftButton
+                and option.rect.contains(event.position().toPoint())):
+            self.delete_requested.emit(index.data(RECORD_ID_ROLE))
+            return True
+        return super().editorEvent(event, model, option, index)
+
+
+def lttb_indices(x, y, threshold):
+    """Largest-Triangle-Three-Buckets downsampling; returns the indices to keep.
+
+    Always keeps the first and last point, and from each of threshold - 2
+    equal buckets in between the point forming the largest triangle with the
+    previously kept point and the mean of the next bucket, which preserves
+    peaks and dips that plain striding would drop.
+    """
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    n = len(x)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+
+    edges = np.append(np.linspace(1, n - 1, threshold - 1).astype(int), n)
+    indices = np.empty(threshold, dtype=np.int64)
+    indices[0], indices[-1] = 0, n - 1
+    a = 0
+    for i in range(threshold - 2):
+        start, end = edges[i], edges[i + 1]
+        next_end = edges[i + 2]
+        avg_x = x[end:next_end].mean()
+        avg_y = y[end:next_end].mean()
+        area = np.abs((x[a] - avg_x) * (y[start:end] - y[a]) - (x[a] - x[start:end]) * (avg_y - y[a]))
+        a = start + int(np.argmax(area))
+        indices[i + 1] = a
+    return indices
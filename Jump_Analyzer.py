@@ -1,31 +1,207 @@
+import os
+import time
+from collections import deque
 import cv2
 import mediapipe as mp
 import numpy as np
+from Analysis_Progress import ProgressTracker
+from Trajectory_Store import SCORED_BY_DETECTOR, SCORED_BY_SEGMENTS
+
+# Major body joints used for the COM estimate
+COM_KEYPOINTS = [
+    mp.solutions.pose.PoseLandmark.LEFT_HIP,
+    mp.solutions.pose.PoseLandmark.RIGHT_HIP,
+    mp.solutions.pose.PoseLandmark.LEFT_SHOULDER,
+    mp.solutions.pose.PoseLandmark.RIGHT_SHOULDER,
+    mp.solutions.pose.PoseLandmark.LEFT_KNEE,
+    mp.solutions.pose.PoseLandmark.RIGHT_KNEE
+]
+
+SMOOTHING_WINDOW = 7  # Moving-average window applied to the COM trajectory
+TAKEOFF_RATIO = 0.95  # Takeoff/landing threshold relative to the lowest COM point
+
+
+def pad_trajectories(trajectories, fill_value=np.nan):
+    """Stack variable-length trajectories into a padded 2-D array plus row lengths"""
+    lengths = np.array([len(trajectory) for trajectory in trajectories], dtype=np.int64)
+    batch = np.full((len(trajectories), lengths.max(initial=0)), fill_value, dtype=np.float64)
+    for row, trajectory in enumerate(trajectories):
+        batch[row, :lengths[row]] = trajectory
+    return batch, lengths
 
 class JumpAnalyzer:
-    def __init__(self, person_height_meters):
+    def __init__(self, person_height_meters, landmark_cache=None, roi_tracking=False,
+                 inference_scale=1.0, inference_height=None, metrics=None, pose_pool=None, pose_graph=True):
         self.person_height_meters = person_height_meters
+        self.landmark_cache = landmark_cache  # Optional Landmark_Cache.LandmarkCache
+        self.roi_tracking = roi_tracking  # Run Pose on a crop around the last detection
+        # Frames are downscaled before inference, either by a fixed factor or to
+        # a target height in pixels (which takes precedence). Never upscaled.
+        self.inference_scale = inference_scale
+        self.inference_height = inference_height
+        self.roi = None  # (x0, y0, x1, y1) pixel crop used for the next frame
+        self.min_detection_confidence = 0.7
+        self.min_tracking_confidence = 0.7
+        self.model_complexity = 1
         self.mp_pose = mp.solutions.pose
-        self.pose = self.mp_pose.Pose(
-            min_detection_confidence=0.7,
-            min_tracking_confidence=0.7
-        )
+        # The Pose graph does not depend on the athlete, so it can come from a
+        # Pose_Pool.PosePool shared by many analyzers; close() hands it back.
+        # With pose_graph=False there is none at all and the analyzer only
+        # scores trajectories, like one after close().
+        self.pose_pool = pose_pool
+        if not pose_graph:
+            self.pose = None
+        elif pose_pool is not None:
+            self.pose = pose_pool.acquire(**self.pose_config())
+        else:
+            self.pose = self.mp_pose.Pose(**self.pose_config())
         self.gravity = 9.81  # m/s²
+        self.metrics = metrics  # Optional Pipeline_Metrics.PipelineMetrics; None disables timing
+
+    def pose_config(self):
+        """Keyword arguments the Pose graph is built with"""
+        return {
+            "model_complexity": self.model_complexity,
+            "min_detection_confidence": self.min_detection_confidence,
+            "min_tracking_confidence": self.min_tracking_confidence
+        }
+
+    def close(self):
+        """Release the Pose graph (back to the pool, if it came from one).
+
+        Trajectory methods such as analyze_trajectory keep working afterwards.
+        """
+        if self.pose is None:
+            return
+        if self.pose_pool is not None:
+            self.pose_pool.release(self.pose)
+        else:
+            self.pose.close()
+        self.pose = None
+
+    def pose_settings(self):
+        """Settings that change the landmarks Pose produces (used as cache key)"""
+        return {
+            "min_detection_confidence": self.min_detection_confidence,
+            "min_tracking_confidence": self.min_tracking_confidence,
+            "model_complexity": self.model_complexity,
+            "roi_tracking": self.roi_tracking,
+            "inference_scale": self.inference_scale,
+            "inference_height": self.inference_height
+        }
+
+    def reset_tracking(self):
+        """Forget tracking state from the previous video"""
+        self.roi = None
+        self.pose.reset()
+
+    def detect_pose(self, frame):
+        """Run Pose on a BGR frame and return its landmarks (None if no person)
+
+        Landmarks are always normalized to the full frame, also when Pose
+        only saw the tracked crop or a downscaled copy of the frame.
+        """
+        if self.metrics is not None:
+            start = time.perf_counter()
+            frame = self.downscale_for_inference(frame)
+            self.metrics.record("resize", time.perf_counter() - start)
+        else:
+            frame = self.downscale_for_inference(frame)
+        if self.roi_tracking and self.roi is not None:
+            x0, y0, x1, y1 = self.roi
+            results = self._process(frame[y0:y1, x0:x1])
+            if results.pose_landmarks:
+                self._map_crop_to_frame(results.pose_landmarks, frame.shape)
+                self._update_roi(results.pose_landmarks, frame.shape)
+                if self.metrics is not None:
+                    self.metrics.count_frame(True)
+                return results.pose_landmarks
+            self.roi = None  # Tracking lost, fall back to full-frame detection
+
+        results = self._process(frame)
+        if self.roi_tracking and results.pose_landmarks:
+            self._update_roi(results.pose_landmarks, frame.shape)
+        if self.metrics is not None:
+            self.metrics.count_frame(results.pose_landmarks is not None)
+        return results.pose_landmarks
+
+    def _process(self, image):
+        """Convert a BGR image to RGB and run Pose on it"""
+        if self.metrics is None:
+            return self.pose.process(cv2.cvtColor(image, cv2.COLOR_BGR2RGB))
+        start = time.perf_counter()
+        rgb = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
+        converted = time.perf_counter()
+        results = self.pose.process(rgb)
+        self.metrics.record("color_convert", converted - start)
+        self.metrics.record("pose", time.perf_counter() - converted)
+        return results
+
+    def downscale_for_inference(self, frame):
+        """Resize a frame to the inference resolution (no-op at full size)"""
+        frame_h, frame_w = frame.shape[:2]
+        if self.inference_height:
+            scale = self.inference_height / frame_h
+        else:
+            scale = self.inference_scale
+        if scale >= 1.0:
+            return frame
+        size = (max(1, round(frame_w * scale)), max(1, round(frame_h * scale)))
+        return cv2.resize(frame, size, interpolation=cv2.INTER_LINEAR)
+
+    def _map_crop_to_frame(self, pose_landmarks, frame_shape):
+        """Convert landmarks normalized to the ROI crop into full-frame coordinates"""
+        x0, y0, x1, y1 = self.roi
+        frame_h, frame_w = frame_shape[:2]
+        crop_w, crop_h = x1 - x0, y1 - y0
+        for lm in pose_landmarks.landmark:
+            lm.x = (x0 + lm.x * crop_w) / frame_w
+            lm.y = (y0 + lm.y * crop_h) / frame_h
+            lm.z = lm.z * crop_w / frame_w
+
+    def _update_roi(self, pose_landmarks, frame_shape):
+        """Move the crop when the athlete gets close to its edges"""
+        frame_h, frame_w = frame_shape[:2]
+        points = [(lm.x, lm.y) for lm in pose_landmarks.landmark if lm.visibility > 0.5]
+        if len(points) < 4:
+            points = [(lm.x, lm.y) for lm in pose_landmarks.landmark]
+        xs, ys = zip(*points)
+        left, right = min(xs) * frame_w, max(xs) * frame_w
+        top, bottom = min(ys) * frame_h, max(ys) * frame_h
+
+        if self.roi is not None:
+            # Keep the crop while the body stays well inside it, so Pose's own
+            # tracker sees a stable image
+            x0, y0, x1, y1 = self.roi
+            margin_x, margin_y = (x1 - x0) * 0.1, (y1 - y0) * 0.1
+            if (left > x0 + margin_x and right < x1 - margin_x
+                    and top > y0 + margin_y and bottom < y1 - margin_y):
+                return
+
+        # Pad generously above the head for the vertical travel of a jump
+        width, height = right - left, bottom - top
+        self.roi = (
+            max(0, int(left - width * 0.5)),
+            max(0, int(top - height * 0.6)),
+            min(frame_w, int(right + width * 0.5)),
+            min(frame_h, int(bottom + height * 0.25))
+        )
+        if self.roi[2] - self.roi[0] < 32 or self.roi[3] - self.roi[1] < 32:
+            self.roi = None  # Too small to be a usable crop
 
     def estimate_center_of_mass(self, landmarks, image_height):
         """More robust COM estimation using major body joints"""
-        keypoints = [
-            self.mp_pose.PoseLandmark.LEFT_HIP,
-            self.mp_pose.PoseLandmark.RIGHT_HIP,
-            self.mp_pose.PoseLandmark.LEFT_SHOULDER,
-            self.mp_pose.PoseLandmark.RIGHT_SHOULDER,
-            self.mp_pose.PoseLandmark.LEFT_KNEE,
-            self.mp_pose.PoseLandmark.RIGHT_KNEE
-        ]
-        
+        if self.metrics is not None:
+            start = time.perf_counter()
+            com_y = self._estimate_center_of_mass(landmarks, image_height)
+            self.metrics.record("center_of_mass", time.perf_counter() - start)
+            return com_y
+        return self._estimate_center_of_mass(landmarks, image_height)
+
+    def _estimate_center_of_mass(self, landmarks, image_height):
         visible_points = [
             landmarks[pt].y * image_height 
-            for pt in keypoints 
+            for pt in COM_KEYPOINTS 
             if landmarks[pt].visibility > 0.7  # Higher confidence threshold
         ]
         
@@ -34,72 +210,389 @@ class JumpAnalyzer:
             
         return np.median(visible_points)  # More robust than mean
 
-    def calculate_flight_time(self, com_positions, fps):
+    def estimate_center_of_mass_from_array(self, landmarks, image_height):
+        """Same estimate as estimate_center_of_mass for an (n_frames, 33, 4) array.
+
+        Returns one COM y per frame, NaN where too few keypoints are visible.
+        """
+        y = landmarks[:, COM_KEYPOINTS, 1].astype(np.float64) * image_height
+        visible = landmarks[:, COM_KEYPOINTS, 3].astype(np.float64) > 0.7
+        com = np.full(len(landmarks), np.nan)
+        enough = visible.sum(axis=1) >= 4
+        if enough.any():
+            com[enough] = np.nanmedian(np.where(visible, y, np.nan)[enough], axis=1)
+        return com
+
+    def calculate_flight_time(self, com_positions, fps, frame_indices=None):
         """More reliable flight time calculation"""
-        if len(com_positions) < 15 or fps <= 5:
-            return 0.0
-        
-        # Smooth more aggressively
-        smoothed_com = np.convolve(com_positions, np.ones(7)/7, mode='valid')
-        
+        if frame_indices is not None:
+            frame_indices = [frame_indices]
+        return float(self.calculate_flight_times(
+            [com_positions], [len(com_positions)], fps, frame_indices
+        )[0])
+
+    def calculate_flight_times(self, com_batch, lengths, fps, frame_indices=None):
+        """Vectorized calculate_flight_time over a batch of trajectories.
+
+        com_batch is a padded (n_trajectories, max_length) array (see
+        pad_trajectories), lengths the real length of each row, and fps either
+        one value or one per row. frame_indices, if given, is padded the same
+        way. Returns an array of jump heights, 0.0 where no jump was found.
+        """
+        com_batch = np.asarray(com_batch, dtype=np.float64)
+        if com_batch.ndim == 1:
+            com_batch = com_batch[np.newaxis, :]
+        n_rows, max_length = com_batch.shape
+        lengths = np.asarray(lengths, dtype=np.int64)
+        fps = np.broadcast_to(np.asarray(fps, dtype=np.float64), (n_rows,))
+        heights = np.zeros(n_rows)
+
+        usable = (lengths >= 15) & (fps > 5)
+        if not usable.any():
+            return heights
+
+        # Smooth more aggressively (same arithmetic as np.convolve(x, np.ones(7)/7, 'valid'))
+        window = SMOOTHING_WINDOW
+        smoothed_length = max_length - window + 1
+        weight = 1 / window
+        smoothed_com = np.zeros((n_rows, smoothed_length))
+        for k in range(window):
+            smoothed_com = smoothed_com + com_batch[:, k:k + smoothed_length] * weight
+
+        columns = np.arange(smoothed_length)
+        row_lengths = (lengths - window + 1)[:, np.newaxis]
+        in_row = columns < row_lengths
+        rows = np.arange(n_rows)
+
         # Find the lowest point (max y value) before ascent
-        lowest_frame = np.argmax(smoothed_com[:len(smoothed_com)//2])
-        lowest_com = smoothed_com[lowest_frame]
-        
+        first_half = columns < row_lengths // 2
+        lowest_frame = np.argmax(np.where(first_half, smoothed_com, -np.inf), axis=1)
+        lowest_com = smoothed_com[rows, lowest_frame]
+
         # Find takeoff (when COM rises above threshold)
-        threshold = lowest_com * 0.95  # 5% above lowest
-        takeoff_frame = next(
-            (i for i in range(lowest_frame, len(smoothed_com)) 
-            if smoothed_com[i] < threshold),
-            None
-        )
-        
-        if takeoff_frame is None:
-            return 0.0
-        
+        threshold = (lowest_com * TAKEOFF_RATIO)[:, np.newaxis]  # 5% above lowest
+        rising = in_row & (columns >= lowest_frame[:, np.newaxis]) & (smoothed_com < threshold)
+        has_takeoff = rising.any(axis=1)
+        takeoff_frame = np.argmax(rising, axis=1)
+
         # Find landing (when COM returns to takeoff level)
-        landing_frame = next(
-            (i for i in range(takeoff_frame + 5, len(smoothed_com))
-            if smoothed_com[i] >= threshold),
-            None
-        )
-        
-        if landing_frame is None:
-            return 0.0
-        
-        flight_time = (landing_frame - takeoff_frame) / fps
-        return (self.gravity * flight_time**2) / 8  # h = gt²/8
+        landed = in_row & (columns >= (takeoff_frame + 5)[:, np.newaxis]) & (smoothed_com >= threshold)
+        has_landing = landed.any(axis=1)
+        landing_frame = np.argmax(landed, axis=1)
+
+        found = usable & has_takeoff & has_landing
+        if frame_indices is not None:
+            # Smoothed sample i is centered on raw sample i + 3; use the real
+            # frame numbers so frames without a detected pose still count
+            frame_indices = np.asarray(frame_indices)
+            offset = window // 2
+            flight_frames = (frame_indices[rows, landing_frame + offset]
+                             - frame_indices[rows, takeoff_frame + offset])
+        else:
+            flight_frames = landing_frame - takeoff_frame
+
+        flight_times = flight_frames[found] / fps[found]
+        # Square with Python floats: pow() can differ from x*x in the last bit
+        heights[found] = [
+            (self.gravity * flight_time**2) / 8  # h = gt²/8
+            for flight_time in flight_times.tolist()
+        ]
+        return heights
+
+    def segment_jumps(self, com_positions, fps, frame_indices=None):
+        """Find every takeoff/landing pair in one pass over a COM trajectory.
+
+        Uses the same smoothing and threshold rules as calculate_flight_time.
+        After each landing the search restarts once the athlete is back up to
+        standing level (the median COM), and a candidate only counts as a
+        jump if its peak rises clearly above that level. Returns a list of
+        dicts with jump_height, flight_time and the takeoff, peak and landing
+        frame numbers.
+        """
+        if len(com_positions) < 15 or fps <= 5:
+            return []
+
+        smoothed_com = np.convolve(com_positions, np.ones(SMOOTHING_WINDOW)/SMOOTHING_WINDOW, mode='valid')
+        standing_com = np.median(smoothed_com)
+        offset = SMOOTHING_WINDOW // 2  # Smoothed sample i is centered on raw sample i + offset
+        if frame_indices is None:
+            frame_indices = range(len(com_positions))
+
+        jumps = []
+        detector = JumpDetector(fps, self.gravity, window=1)
+        recovering = False  # Standing back up after a landing
+        for i, value in enumerate(smoothed_com.tolist()):
+            if recovering:
+                if value > standing_com:
+                    continue
+                recovering = False
+                detector.reset()
+
+            detector.update(value, frame_indices[i + offset])
+            if not detector.landed:
+                continue
+
+            if detector.peak_com < standing_com * TAKEOFF_RATIO:
+                jumps.append({
+                    "jump_height": detector.jump_height,
+                    "flight_time": (detector.landing_frame - detector.takeoff_frame) / fps,
+                    "takeoff_frame": detector.takeoff_frame,
+                    "peak_frame": detector.peak_frame,
+                    "landing_frame": detector.landing_frame
+                })
+            recovering = True
+        return jumps
+
+    def analyze_jump(self, video_path, stop_at_landing=False, on_progress=None):
+        """Analyze jump using physics-based method
+
+        With stop_at_landing, decoding stops as soon as the streaming
+        detector confirms a landing and its height is returned.
+        on_progress, if given, receives throttled ProgressReports.
+        """
+        trajectory = self.collect_trajectory(video_path, stop_at_landing, on_progress)
+        if trajectory is None:
+            return None, None
+
+        com_positions, fps, frame_indices, frame_count = trajectory
+        if stop_at_landing and self.detector.landed:
+            return self.detector.jump_height, com_positions
+        return self.analyze_trajectory(com_positions, fps, frame_indices)
+
+    def collect_trajectory(self, video_path, stop_at_landing=False, on_progress=None):
+        """Run Pose over every frame and return (com_positions, fps, frame_indices, frame_count)
+
+        With a landmark cache, a video analysed before with the same Pose
+        settings is scored from its stored landmarks without decoding it.
+        With stop_at_landing, samples are fed to self.detector and the
+        trajectory ends at the first confirmed landing. on_progress receives
+        ProgressReports a few times per second and once at the end.
+        If self.metrics is set it is reset and filled with this run's timings.
+        """
+        self.detector = None
+        if self.metrics is not None:
+            self.metrics.reset()
+        cache_key = None
+        if self.landmark_cache is not None and os.path.isfile(video_path):
+            cache_key = self.landmark_cache.make_key(video_path, self.pose_settings())
+            cached = self.landmark_cache.load(cache_key)
+            if cached is not None:
+                trajectory = self._trajectory_from_landmarks(*cached)
+                if stop_at_landing:
+                    trajectory = self._truncate_at_landing(*trajectory)
+                if on_progress:
+                    progress = ProgressTracker(trajectory[3], on_progress)
+                    progress.frames_done = trajectory[3]
+                    progress.finish(timed=False)  # No frames were decoded, so there is no rate
+                return trajectory
 
-    def analyze_jump(self, video_path):
-        """Analyze jump using physics-based method"""
         cap = cv2.VideoCapture(video_path)
         if not cap.isOpened():
-            return None, None
+            return None
 
         fps = cap.get(cv2.CAP_PROP_FPS)
+        if stop_at_landing:
+            self.detector = JumpDetector(fps, self.gravity)
+        progress = None
+        if on_progress:
+            # Frame count is read once; the loop only bumps a counter
+            progress = ProgressTracker(cap.get(cv2.CAP_PROP_FRAME_COUNT), on_progress)
         com_positions = []
+        frame_indices = []
+        frame_index = 0
+        image_height = 0
+        landmark_arrays = []
+        detected_frames = []
 
         while cap.isOpened():
-            ret, frame = cap.read()
+            if self.metrics is not None:
+                start = time.perf_counter()
+                ret, frame = cap.read()
+                self.metrics.record("decode", time.perf_counter() - start)
+            else:
+                ret, frame = cap.read()
             if not ret:
                 break
 
-            results = self.pose.process(cv2.cvtColor(frame, cv2.COLOR_BGR2RGB))
+            image_height = frame.shape[0]
+            pose_landmarks = self.detect_pose(frame)
+            if progress is not None:
+                progress.frame_done()
             
-            if results.pose_landmarks:
+            if pose_landmarks:
+                if cache_key is not None:
+                    landmark_arrays.append(self.landmarks_to_array(pose_landmarks))
+                    detected_frames.append(frame_index)
+
                 com_y = self.estimate_center_of_mass(
-                    results.pose_landmarks.landmark,
-                    frame.shape[0]
+                    pose_landmarks.landmark,
+                    image_height
                 )
                 if com_y is not None:
                     com_positions.append(com_y)
+                    frame_indices.append(frame_index)
+                    if self.detector is not None:
+                        self.detector.update(com_y, frame_index)
+                        if self.detector.landed:
+                            frame_index += 1
+                            break
+            frame_index += 1
 
         cap.release()
+        if progress is not None:
+            progress.finish()
+
+        # A trajectory cut short at landing would poison the cache
+        if cache_key is not None and not (self.detector is not None and self.detector.landed):
+            self.landmark_cache.store(
+                cache_key, landmark_arrays, detected_frames, frame_index, fps, image_height
+            )
+
+        return com_positions, fps, frame_indices, frame_index
 
+    def _truncate_at_landing(self, com_positions, fps, frame_indices, frame_count):
+        self.detector = JumpDetector(fps, self.gravity)
+        for sample, (com_y, frame_index) in enumerate(zip(com_positions, frame_indices)):
+            self.detector.update(com_y, frame_index)
+            if self.detector.landed:
+                return com_positions[:sample + 1], fps, frame_indices[:sample + 1], frame_index + 1
+        return com_positions, fps, frame_indices, frame_count
+
+    def landmarks_to_array(self, pose_landmarks):
+        """Pack Pose landmarks into a (33, 4) float32 array of x, y, z, visibility"""
+        return np.array(
+            [(lm.x, lm.y, lm.z, lm.visibility) for lm in pose_landmarks.landmark],
+            dtype=np.float32
+        )
+
+    def _trajectory_from_landmarks(self, landmarks, detected_frames, frame_count, fps, image_height):
+        com = self.estimate_center_of_mass_from_array(landmarks, image_height)
+        valid = ~np.isnan(com)
+        return com[valid].tolist(), fps, detected_frames[valid].tolist(), frame_count
+
+    def analyze_trajectory(self, com_positions, fps, frame_indices=None):
+        """Analyze an already collected COM trajectory without touching the video.
+
+        frame_indices holds the video frame number of each COM sample, so
+        frames where no pose was found do not shorten the measured flight.
+        """
         if len(com_positions) < 10:
             return None, None
 
         # Calculate jump height using physics
-        jump_height = self.calculate_flight_time(com_positions, fps)
+        jump_height = self.calculate_flight_time(com_positions, fps, frame_indices)
         
-        return jump_height, com_positions
\ No newline at end of file
+        return jump_height, com_positions
+
+    def rescore_trajectory(self, com_positions, fps, frame_indices=None, scored_by=None):
+        """Score a stored trajectory again with the method that produced its saved height.
+
+        scored_by is a Trajectory_Store.SCORED_BY_* value. Trajectories saved
+        without one count as detector runs if the streaming detector lands on
+        their last sample (they were cut at the landing), else as
+        analyze_trajectory runs. Returns the jump height in meters or None.
+        """
+        if frame_indices is None:
+            frame_indices = list(range(len(com_positions)))
+
+        if scored_by == SCORED_BY_SEGMENTS:
+            # A slice holds one jump in its middle; prefer that one if the
+            # edges of the slice look like jumps too
+            jumps = self.segment_jumps(com_positions, fps, frame_indices)
+            if not jumps:
+                return None
+            middle = frame_indices[0] + frame_indices[-1]
+            jump = min(jumps, key=lambda jump: abs(jump["takeoff_frame"] + jump["landing_frame"] - middle))
+            return jump["jump_height"]
+
+        if scored_by in (SCORED_BY_DETECTOR, None):
+            detector = JumpDetector(fps, self.gravity)
+            for com_y, frame_index in zip(com_positions, frame_indices):
+                detector.update(com_y, frame_index)
+                if detector.landed:
+                    break
+            cut_at_landing = detector.landed and detector.landing_frame == frame_indices[-1]
+            if scored_by == SCORED_BY_DETECTOR or cut_at_landing:
+                return detector.jump_height
+
+        jump_height, _ = self.analyze_trajectory(com_positions, fps, frame_indices)
+        return jump_height
+
+class JumpDetector:
+    """Streaming takeoff/peak/landing detector fed one COM sample at a time.
+
+    Uses the same rules as calculate_flight_time, but with a causal
+    (trailing) moving average in place of the centered window, so each event
+    is known as soon as the sample that triggers it arrives.
+    """
+    WAITING = "waiting"
+    AIRBORNE = "airborne"
+    LANDED = "landed"
+
+    def __init__(self, fps, gravity=9.81, window=SMOOTHING_WINDOW):
+        self.fps = fps
+        self.gravity = gravity
+        self.window = window
+        self.reset()
+
+    def reset(self):
+        self.state = self.WAITING
+        self.recent = deque(maxlen=self.window)
+        self.samples = 0
+        self.lowest_com = None  # Max smoothed y seen before takeoff
+        self.threshold = None
+        self.samples_in_air = 0
+        self.peak_com = None
+        self.peak_reported = False
+        self.takeoff_frame = None
+        self.peak_frame = None
+        self.landing_frame = None
+        self.jump_height = None
+
+    @property
+    def landed(self):
+        return self.state == self.LANDED
+
+    def update(self, com_y, frame_index=None):
+        """Feed one COM sample and return the list of (event, frame_index) it triggered"""
+        if frame_index is None:
+            frame_index = self.samples
+        self.samples += 1
+        self.recent.append(com_y)
+        if len(self.recent) < self.window or self.state == self.LANDED:
+            return []
+
+        smoothed = sum(self.recent) / self.window
+        events = []
+
+        if self.state == self.WAITING:
+            if self.lowest_com is None or smoothed >= self.lowest_com:
+                # Still going down into the countermovement
+                self.lowest_com = smoothed
+            elif smoothed < self.lowest_com * TAKEOFF_RATIO:
+                self.state = self.AIRBORNE
+                self.threshold = self.lowest_com * TAKEOFF_RATIO
+                self.takeoff_frame = frame_index
+                self.peak_com, self.peak_frame = smoothed, frame_index
+                events.append(("takeoff", frame_index))
+
+        elif self.state == self.AIRBORNE:
+            self.samples_in_air += 1
+            if smoothed < self.peak_com:
+                self.peak_com, self.peak_frame = smoothed, frame_index
+            elif not self.peak_reported and smoothed > self.peak_com + (self.threshold - self.peak_com) / 4:
+                # Clearly on the way down again
+                self.peak_reported = True
+                events.append(("peak", self.peak_frame))
+
+            if self.samples_in_air >= 5 and smoothed >= self.threshold:
+                if not self.peak_reported:
+                    self.peak_reported = True
+                    events.append(("peak", self.peak_frame))
+                self.state = self.LANDED
+                self.landing_frame = frame_index
+                flight_time = (self.landing_frame - self.takeoff_frame) / self.fps if self.fps > 5 else 0.0
+                self.jump_height = (self.gravity * flight_time**2) / 8  # h = gt²/8
+                events.append(("landing", frame_index))
+
+        return events
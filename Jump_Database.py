@@ -0,0 +1,270 @@
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from Trajectory_Store import CREATE_TRAJECTORY_TABLE, load_trajectory, save_trajectory
+
+DEFAULT_DB_PATH = "users.db"
+DATE_FORMAT = "%m/%d/%Y %I:%M:%S %p"
+SCHEMA_VERSION = 3  # Stored in PRAGMA user_version
+
+
+class JumpDatabase:
+    """Repository for users, jump records and stored trajectories.
+
+    Each thread gets one long-lived connection (WAL journaling, foreign keys
+    on), opened on first use, so callers never pay for a file open per query.
+    Connections run in autocommit mode and every write goes through
+    transaction(); the SQL text is constant, so sqlite3's statement cache
+    reuses the prepared statements.
+    """
+
+    def __init__(self, path=DEFAULT_DB_PATH):
+        self.path = path
+        self._local = threading.local()
+        self._connections = []
+        self._lock = threading.Lock()
+
+    @property
+    def connection(self):
+        conn = getattr(self._local, "connection", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, isolation_level=None, cached_statements=64,
+                                   check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")  # Safe with WAL, avoids an fsync per commit
+            conn.execute("PRAGMA foreign_keys=ON")
+            self._local.connection = conn
+            with self._lock:
+                self._connections.append(conn)
+        return conn
+
+    @contextmanager
+    def transaction(self):
+        """Run the enclosed statements in one write transaction and yield a cursor"""
+        conn = self.connection
+        cursor = conn.cursor()
+        cursor.execute("BEGIN IMMEDIATE")
+        try:
+            yield cursor
+        except BaseException:
+            cursor.execute("ROLLBACK")
+            raise
+        cursor.execute("COMMIT")
+
+    def close(self):
+        """Close the connections of all threads"""
+        with self._lock:
+            for conn in self._connections:
+                conn.close()
+            self._connections.clear()
+        self._local = threading.local()
+
+    def initialize(self):
+        """Create or update the schema."""
+        with self.transaction() as cursor:
+            cursor.execute('''CREATE TABLE IF NOT EXISTS users (
+                            email TEXT PRIMARY KEY,
+                            password TEXT)''')
+
+            # Check if height column exists, add if not
+            cursor.execute("PRAGMA table_info(users)")
+            columns = [column[1] for column in cursor.fetchall()]
+            if 'height' not in columns:
+                cursor.execute("ALTER TABLE users ADD COLUMN height INTEGER DEFAULT 72")  # Default to 72 inches
+
+            cursor.execute('''CREATE TABLE IF NOT EXISTS jump_records (
+                            id INTEGER PRIMARY KEY AUTOINCREMENT,
+                            email TEXT NOT NULL,
+                            date TEXT NOT NULL,
+                            jump_height REAL NOT NULL,
+                            ts INTEGER,
+                            FOREIGN KEY(email) REFERENCES users(email))''')
+
+            # COM trajectory behind each jump, so it can be re-scored without the video
+            cursor.execute(CREATE_TRAJECTORY_TABLE)
+
+            cursor.execute("PRAGMA user_version")
+            version = cursor.fetchone()[0]
+            if version < 1:
+                self._add_timestamps(cursor)
+            if version < 2:
+                self._add_jump_stats(cursor)
+            if version < 3:
+                self._add_scoring_method(cursor)
+
+            cursor.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
+    def _add_timestamps(self, cursor):
+        """Migration 1: add an epoch ts column and an (email, ts) index.
+
+        The text dates sort by month rather than by time, so existing rows
+        are backfilled by parsing them. Runs inside initialize's transaction.
+        """
+        cursor.execute("PRAGMA table_info(jump_records)")
+        if 'ts' not in [column[1] for column in cursor.fetchall()]:
+            cursor.execute("ALTER TABLE jump_records ADD COLUMN ts INTEGER")
+
+        cursor.execute("SELECT id, date FROM jump_records WHERE ts IS NULL")
+        updates = []
+        for record_id, date in cursor.fetchall():
+            try:
+                ts = int(datetime.strptime(date, DATE_FORMAT).timestamp())
+            except (TypeError, ValueError):
+                ts = 0  # Unparseable dates sort first
+            updates.append((ts, record_id))
+        cursor.executemany("UPDATE jump_records SET ts=? WHERE id=?", updates)
+
+        # The composite index also serves lookups by email alone
+        cursor.execute("DROP INDEX IF EXISTS idx_email")
+        cursor.execute('''CREATE INDEX IF NOT EXISTS idx_email_ts
+                        ON jump_records(email, ts)''')
+
+    def _add_jump_stats(self, cursor):
+        """Migration 2: per-athlete count, total and best kept up to date by triggers.
+
+        The best jump only needs a rescan when the best one is deleted.
+        """
+        cursor.execute('''CREATE TABLE IF NOT EXISTS jump_stats (
+                        email TEXT PRIMARY KEY,
+                        jump_count INTEGER NOT NULL,
+                        jump_total REAL NOT NULL,
+                        best_jump REAL)''')
+        cursor.execute('''CREATE TRIGGER IF NOT EXISTS jump_stats_insert AFTER INSERT ON jump_records
+                        BEGIN
+                            INSERT INTO jump_stats (email, jump_count, jump_total, best_jump)
+                            VALUES (NEW.email, 1, NEW.jump_height, NEW.jump_height)
+                            ON CONFLICT(email) DO UPDATE SET
+                                jump_count = jump_count + 1,
+                                jump_total = jump_total + excluded.jump_total,
+                                best_jump = MAX(COALESCE(best_jump, excluded.best_jump), excluded.best_jump);
+                        END''')
+        cursor.execute('''CREATE TRIGGER IF NOT EXISTS jump_stats_delete AFTER DELETE ON jump_records
+                        BEGIN
+                            UPDATE jump_stats SET
+                                jump_count = jump_count - 1,
+                                jump_total = jump_total - OLD.jump_height,
+                                best_jump = CASE WHEN OLD.jump_height >= best_jump
+                                    THEN (SELECT MAX(jump_height) FROM jump_records WHERE email = OLD.email)
+                                    ELSE best_jump END
+                            WHERE email = OLD.email;
+                        END''')
+        cursor.execute("DELETE FROM jump_stats")
+        cursor.execute('''INSERT INTO jump_stats (email, jump_count, jump_total, best_jump)
+                        SELECT email, COUNT(*), SUM(jump_height), MAX(jump_height)
+                        FROM jump_records GROUP BY email''')
+
+    def _add_scoring_method(self, cursor):
+        """Migration 3: record which method scored each stored trajectory.
+
+        Older rows keep NULL; re-scoring infers the method for those.
+        """
+        cursor.execute("PRAGMA table_info(jump_trajectories)")
+        if 'scored_by' not in [column[1] for column in cursor.fetchall()]:
+            cursor.execute("ALTER TABLE jump_trajectories ADD COLUMN scored_by TEXT")
+
+    # Users
+
+    def authenticate(self, email, password):
+        """Return True if the email and password match a user"""
+        row = self.connection.execute(
+            "SELECT 1 FROM users WHERE email=? AND password=?", (email, password)).fetchone()
+        return row is not None
+
+    def user_exists(self, email):
+        return self.connection.execute("SELECT 1 FROM users WHERE email=?", (email,)).fetchone() is not None
+
+    def create_user(self, email, password, height):
+        """Add a user; returns False if the email is already registered"""
+        with self.transaction() as cursor:
+            cursor.execute("SELECT 1 FROM users WHERE email=?", (email,))
+            if cursor.fetchone():
+                return False
+            cursor.execute("INSERT INTO users (email, password, height) VALUES (?, ?, ?)",
+                           (email, password, height))
+        return True
+
+    def get_height(self, email):
+        """Stored height in inches, or None if the user or the height is missing"""
+        row = self.connection.execute("SELECT height FROM users WHERE email=?", (email,)).fetchone()
+        return row[0] if row else None
+
+    def set_height(self, email, height):
+        with self.transaction() as cursor:
+            cursor.execute("UPDATE users SET height=? WHERE email=?", (height, email))
+
+    # Jump records
+
+    def add_jumps(self, email, jump_heights, trajectories=None):
+        """Insert jump records (and optional trajectories) in one transaction.
+
+        trajectories holds a (com_positions, fps, frame_indices, scored_by)
+        tuple or None per jump, scored_by being a Trajectory_Store.SCORED_BY_*
+        value. Returns the new (id, date, jump_height, ts) rows.
+        """
+        now = datetime.now()
+        date, ts = now.strftime(DATE_FORMAT), int(now.timestamp())
+        records = []
+        with self.transaction() as cursor:
+            for jump_height, trajectory in zip(jump_heights, trajectories or [None] * len(jump_heights)):
+                cursor.execute('''INSERT INTO jump_records
+                                (email, date, jump_height, ts)
+                                VALUES (?, ?, ?, ?)''',
+                               (email, date, jump_height, ts))
+                records.append((cursor.lastrowid, date, jump_height, ts))
+                if trajectory is not None:
+                    save_trajectory(cursor, cursor.lastrowid, *trajectory)
+        return records
+
+    def jump_history(self, email, newest_first=False):
+        """Return (id, date, jump_height) rows for a user, read in idx_email_ts order"""
+        # id breaks ties between jumps saved together; it is the rowid, so still part of the index
+        if newest_first:
+            query = '''SELECT id, date, jump_height FROM jump_records
+                    WHERE email=? ORDER BY ts DESC, id DESC'''
+        else:
+            query = '''SELECT id, date, jump_height FROM jump_records
+                    WHERE email=? ORDER BY ts ASC, id ASC'''
+        return self.connection.execute(query, (email,)).fetchall()
+
+    def jump_page(self, email, before=None, limit=100):
+        """Return up to limit (id, date, jump_height, ts) rows, newest first.
+
+        Keyset pagination: pass the (ts, id) of the last row of the previous
+        page as before, so every page is a short range scan of idx_email_ts
+        no matter how deep into the history it is.
+        """
+        if before is None:
+            return self.connection.execute('''SELECT id, date, jump_height, ts FROM jump_records
+                                        WHERE email=? ORDER BY ts DESC, id DESC LIMIT ?''',
+                                           (email, limit)).fetchall()
+        return self.connection.execute('''SELECT id, date, jump_height, ts FROM jump_records
+                                    WHERE email=? AND (ts, id) < (?, ?)
+                                    ORDER BY ts DESC, id DESC LIMIT ?''',
+                                       (email, before[0], before[1], limit)).fetchall()
+
+    def delete_jump(self, record_id):
+        """Delete a jump record; its stored trajectory goes with it"""
+        with self.transaction() as cursor:
+            cursor.execute("DELETE FROM jump_records WHERE id=?", (record_id,))
+
+    def jump_stats(self, email, recent_days=30):
+        """Return (count, average, best, best in the last recent_days) for a user.
+
+        The first three come from the trigger-maintained jump_stats row; the
+        recent best is a range scan of idx_email_ts. Missing values are None.
+        """
+        row = self.connection.execute(
+            "SELECT jump_count, jump_total, best_jump FROM jump_stats WHERE email=?", (email,)).fetchone()
+        if row is None or row[0] == 0:
+            return 0, None, None, None
+        count, total, best = row
+        since = int(time.time()) - recent_days * 24 * 60 * 60
+        recent_best = self.connection.execute(
+            "SELECT MAX(jump_height) FROM jump_records WHERE email=? AND ts >= ?", (email, since)).fetchone()[0]
+        return count, total / count, best, recent_best
+
+    def get_trajectory(self, record_id):
+        """Return (com_positions, fps, frame_indices, scored_by, landmarks) or None"""
+        return load_trajectory(self.connection.cursor(), record_id)
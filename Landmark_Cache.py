@@ -0,0 +1,98 @@
+import hashlib
+import json
+import os
+import numpy as np
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".vert_tester", "landmark_cache")
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+
+
+class LandmarkCache:
+    """On-disk cache of raw per-frame Pose landmarks.
+
+    Entries are keyed by a hash of the video contents plus the Pose settings
+    that produced them, and stored as compressed .npz files holding the
+    (x, y, z, visibility) of all 33 landmarks for every frame with a detection.
+    When the directory grows past max_bytes the least recently used entries
+    are deleted.
+    """
+
+    def __init__(self, cache_dir=DEFAULT_CACHE_DIR, max_bytes=DEFAULT_MAX_BYTES):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self._video_hashes = {}  # (path, size, mtime) -> content hash
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    def hash_video(self, video_path):
+        """SHA-256 of the video file, remembered while the file is unchanged"""
+        stat = os.stat(video_path)
+        memo_key = (os.path.abspath(video_path), stat.st_size, stat.st_mtime_ns)
+        if memo_key not in self._video_hashes:
+            digest = hashlib.sha256()
+            with open(video_path, "rb") as f:
+                for chunk in iter(lambda: f.read(1024 * 1024), b""):
+                    digest.update(chunk)
+            self._video_hashes[memo_key] = digest.hexdigest()
+        return self._video_hashes[memo_key]
+
+    def make_key(self, video_path, pose_settings):
+        settings = json.dumps(pose_settings, sort_keys=True)
+        return hashlib.sha256(f"{self.hash_video(video_path)}:{settings}".encode()).hexdigest()
+
+    def _entry_path(self, key):
+        return os.path.join(self.cache_dir, f"{key}.npz")
+
+    def load(self, key):
+        """Return (landmarks, frame_indices, frame_count, fps, image_height) or None"""
+        path = self._entry_path(key)
+        try:
+            with np.load(path) as entry:
+                result = (
+                    entry["landmarks"],
+                    entry["frame_indices"],
+                    int(entry["frame_count"]),
+                    float(entry["fps"]),
+                    int(entry["image_height"])
+                )
+        except (OSError, KeyError, ValueError):
+            return None
+
+        os.utime(path)  # Mark as recently used
+        return result
+
+    def store(self, key, landmarks, frame_indices, frame_count, fps, image_height):
+        """Write an entry atomically, then evict old entries if over the size cap"""
+        path = self._entry_path(key)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as f:
+            np.savez_compressed(
+                f,
+                landmarks=np.asarray(landmarks, dtype=np.float32).reshape(-1, 33, 4),
+                frame_indices=np.asarray(frame_indices, dtype=np.int32),
+                frame_count=frame_count,
+                fps=fps,
+                image_height=image_height
+            )
+        os.replace(tmp_path, path)
+        self.evict()
+
+    def evict(self):
+        entries = []
+        for name in os.listdir(self.cache_dir):
+            if not name.endswith(".npz"):
+                continue
+            try:
+                stat = os.stat(os.path.join(self.cache_dir, name))
+            except OSError:
+                continue  # Removed by another process
+            entries.append((stat.st_mtime, stat.st_size, name))
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, name in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(os.path.join(self.cache_dir, name))
+            except OSError:
+                pass
+            total -= size
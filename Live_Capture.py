@@ -0,0 +1,270 @@
+"""Live jump testing from a camera (or a video file played back in real time).
+
+Example without a camera:
+    python Live_Capture.py --source clip.mp4
+"""
+import argparse
+import threading
+import time
+from collections import deque
+import cv2
+import numpy as np
+from Analysis_Progress import ProgressTracker
+from Jump_Analyzer import JumpAnalyzer, JumpDetector
+
+STANDING_WINDOW_SECONDS = 1.0  # Ground contact the standing height estimate looks back over
+
+
+class FrameRingBuffer:
+    """Fixed-size ring of preallocated frame slots shared by capture, inference and preview.
+
+    The capture thread decodes straight into the oldest slot, so when
+    inference falls behind the oldest frames are dropped. Readers always get
+    the newest frame and pin its slot while they use it, so the writer never
+    overwrites a frame that is still being read; no frame is copied.
+    """
+
+    def __init__(self, capacity=8):
+        self.capacity = capacity
+        self.slots = None  # Allocated on the first frame, once its shape is known
+        self.sequence = [-1] * capacity  # Capture sequence number held by each slot
+        self.timestamps = [0.0] * capacity
+        self.pins = [0] * capacity
+        self.latest_slot = None
+        self.written = 0
+        self.closed = False
+        self.condition = threading.Condition()
+
+    def begin_write(self, frame_shape):
+        """Return (slot, array) to capture the next frame into"""
+        with self.condition:
+            if self.slots is None or self.slots.shape[1:] != frame_shape:
+                self.slots = np.zeros((self.capacity,) + frame_shape, dtype=np.uint8)
+            # Oldest slot that nobody is reading
+            free = [i for i in range(self.capacity) if self.pins[i] == 0 and i != self.latest_slot]
+            slot = min(free, key=lambda i: self.sequence[i])
+            self.sequence[slot] = -1  # Invalid until committed
+            return slot, self.slots[slot]
+
+    def commit(self, slot, timestamp):
+        with self.condition:
+            self.sequence[slot] = self.written
+            self.timestamps[slot] = timestamp
+            self.latest_slot = slot
+            self.written += 1
+            self.condition.notify_all()
+
+    def close(self):
+        with self.condition:
+            self.closed = True
+            self.condition.notify_all()
+
+    def acquire_latest(self, newer_than=-1, timeout=None):
+        """Pin and return (slot, sequence, timestamp, frame) for the newest frame.
+
+        Waits for a frame with a sequence number above newer_than. Returns
+        None on timeout or when the buffer is closed with nothing newer.
+        Every acquired slot must be handed back with release().
+        """
+        with self.condition:
+            ready = self.condition.wait_for(
+                lambda: self.closed or (self.latest_slot is not None
+                                        and self.sequence[self.latest_slot] > newer_than),
+                timeout
+            )
+            if not ready or self.latest_slot is None or self.sequence[self.latest_slot] <= newer_than:
+                return None
+            slot = self.latest_slot
+            self.pins[slot] += 1
+            return slot, self.sequence[slot], self.timestamps[slot], self.slots[slot]
+
+    def release(self, slot):
+        with self.condition:
+            self.pins[slot] -= 1
+
+
+class CaptureThread(threading.Thread):
+    """Reads frames from a camera index or a video file into a FrameRingBuffer.
+
+    Video files are paced at their native frame rate so they behave like a
+    camera, which makes the live mode testable without hardware.
+    """
+
+    def __init__(self, source, ring_buffer):
+        super().__init__(daemon=True)
+        self.source = source
+        self.ring_buffer = ring_buffer
+        self.is_file = isinstance(source, str)
+        self.stopped = threading.Event()
+        self.cap = cv2.VideoCapture(source)
+        if not self.cap.isOpened():
+            raise IOError(f"Could not open capture source: {source}")
+        if not self.is_file:
+            self.cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)  # Keep driver-side latency low
+        self.fps = self.cap.get(cv2.CAP_PROP_FPS) or 30.0
+
+    def stop(self):
+        self.stopped.set()
+
+    def run(self):
+        try:
+            ret, frame = self.cap.read()
+            if not ret:
+                return
+            start = time.perf_counter()
+            frame_shape = frame.shape
+            frames = 0
+            while not self.stopped.is_set():
+                slot, target = self.ring_buffer.begin_write(frame_shape)
+                if frames == 0:
+                    target[...] = frame  # First frame was read to learn the frame size
+                else:
+                    if self.is_file:
+                        # Play back at real-time pace
+                        delay = start + frames / self.fps - time.perf_counter()
+                        if delay > 0:
+                            time.sleep(delay)
+                    ret, _ = self.cap.read(target)
+                    if not ret:
+                        break
+                self.ring_buffer.commit(slot, time.perf_counter())
+                frames += 1
+        finally:
+            self.cap.release()
+            self.ring_buffer.close()
+
+
+class LiveJumpSession:
+    """Captures frames on one thread and runs Pose on the newest frame on another.
+
+    Every confirmed landing is reported through on_jump(height_meters), after
+    which the detector re-arms once the athlete is back at standing height.
+    Standing height is the median COM of the last STANDING_WINDOW_SECONDS of
+    samples on the ground, so it follows the athlete around the room.
+    on_progress, if given, receives throttled ProgressReports with the
+    analysis rate and the frames dropped because inference fell behind.
+    """
+
+    def __init__(self, analyzer, source=0, buffer_size=8,
+                 on_jump=None, on_event=None, on_com=None, on_error=None, on_progress=None):
+        self.analyzer = analyzer
+        self.ring_buffer = FrameRingBuffer(buffer_size)
+        self.capture = CaptureThread(source, self.ring_buffer)
+        self.fps = self.capture.fps
+        self.detector = JumpDetector(self.fps, analyzer.gravity)
+        self.on_jump = on_jump
+        self.on_event = on_event
+        self.on_com = on_com
+        self.on_error = on_error
+        self.on_progress = on_progress
+        self.stopped = threading.Event()
+        self.inference_thread = threading.Thread(target=self._run_inference, daemon=True)
+        self.frames_analyzed = 0
+        self.frames_dropped = 0
+
+    def start(self):
+        self.capture.start()
+        self.inference_thread.start()
+
+    def stop(self):
+        self.stopped.set()
+        self.capture.stop()
+
+    def wait(self, timeout=None):
+        """Join both threads; returns True once they have exited"""
+        self.capture.join(timeout)
+        self.inference_thread.join(timeout)
+        return not (self.capture.is_alive() or self.inference_thread.is_alive())
+
+    def _run_inference(self):
+        try:
+            self._inference_loop()
+        except Exception as e:
+            self.stop()
+            if self.on_error:
+                self.on_error(str(e))
+
+    def _inference_loop(self):
+        last_sequence = -1
+        ground_samples = deque(maxlen=max(1, int(round(self.fps * STANDING_WINDOW_SECONDS))))
+        recovering = False
+        # A camera has no frame count, so reports carry counts and rates only
+        progress = ProgressTracker(0, self.on_progress) if self.on_progress else None
+        while not self.stopped.is_set():
+            latest = self.ring_buffer.acquire_latest(last_sequence, timeout=0.5)
+            if latest is None:
+                if self.ring_buffer.closed:
+                    break
+                continue
+
+            slot, sequence, timestamp, frame = latest
+            try:
+                pose_landmarks = self.analyzer.detect_pose(frame)
+                image_height = frame.shape[0]
+            finally:
+                self.ring_buffer.release(slot)
+
+            dropped = sequence - last_sequence - 1 if last_sequence >= 0 else 0
+            self.frames_dropped += dropped
+            last_sequence = sequence
+            self.frames_analyzed += 1
+            if progress is not None:
+                for _ in range(dropped):
+                    progress.frame_done(dropped=True)
+                progress.frame_done()
+
+            if not pose_landmarks:
+                continue
+            com_y = self.analyzer.estimate_center_of_mass(pose_landmarks.landmark, image_height)
+            if com_y is None:
+                continue
+            if self.on_com:
+                self.on_com(com_y, image_height)
+
+            if self.detector.state != JumpDetector.AIRBORNE:
+                ground_samples.append(com_y)
+            if recovering:
+                # Wait until the athlete stands back up before looking for the next jump
+                if com_y > np.median(ground_samples):
+                    continue
+                recovering = False
+                self.detector.reset()
+
+            # Capture timestamps keep flight time right when frames are dropped
+            for event, frame_time in self.detector.update(com_y, timestamp * self.fps):
+                if self.on_event:
+                    self.on_event(event)
+            if self.detector.landed:
+                if self.on_jump:
+                    self.on_jump(self.detector.jump_height)
+                recovering = True
+        if progress is not None:
+            progress.finish()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Measure jumps live from a camera or a video file.")
+    parser.add_argument("--source", default="0",
+                        help="Camera index or video file played back in real time (default: 0)")
+    parser.add_argument("--height-inches", type=int, default=72, help="Athlete height")
+    args = parser.parse_args(argv)
+
+    source = int(args.source) if args.source.isdigit() else args.source
+    session = LiveJumpSession(
+        JumpAnalyzer(args.height_inches * 0.0254),
+        source,
+        on_jump=lambda height: print(f"Jump: {height * 39.37:.1f} inches", flush=True),
+        on_event=lambda event: print(event, flush=True),
+        on_error=lambda error: print(f"Error: {error}", flush=True)
+    )
+    session.start()
+    try:
+        while session.capture.is_alive() or session.inference_thread.is_alive():
+            session.wait(0.5)
+    except KeyboardInterrupt:
+        session.stop()
+    print(f"Analyzed {session.frames_analyzed} frames, dropped {session.frames_dropped}")
+
+
+if __name__ == "__main__":
+    main()
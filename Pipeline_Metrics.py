@@ -0,0 +1,119 @@
+import json
+import os
+import time
+from collections import deque
+import numpy as np
+
+QUANTILES = (0.5, 0.95, 0.99)
+
+
+class PipelineMetrics:
+    """Per-stage latency samples and pose counters for one analysis.
+
+    Instrumented code only calls into this when an instance is attached
+    (JumpAnalyzer(metrics=...)); with metrics=None the cost is one attribute
+    check per stage. The newest max_samples latencies of each stage are kept
+    for the percentiles, while counts and totals cover the whole run.
+    Durations are in seconds.
+    """
+
+    def __init__(self, max_samples=100000):
+        self.max_samples = max_samples
+        self.reset()
+
+    def reset(self):
+        """Start a new analysis"""
+        self.samples = {}  # stage -> deque of durations
+        self.totals = {}  # stage -> [count, sum]
+        self.frames_processed = 0
+        self.pose_misses = 0
+        self.started_at = time.time()
+
+    def record(self, stage, seconds):
+        samples = self.samples.get(stage)
+        if samples is None:
+            samples = self.samples.setdefault(stage, deque(maxlen=self.max_samples))
+            self.totals.setdefault(stage, [0, 0.0])
+        samples.append(seconds)
+        totals = self.totals[stage]
+        totals[0] += 1
+        totals[1] += seconds
+
+    def count_frame(self, pose_found):
+        self.frames_processed += 1
+        if not pose_found:
+            self.pose_misses += 1
+
+    def summary(self):
+        """Return a JSON-serializable dict of counters and per-stage percentiles"""
+        stages = {}
+        for stage, samples in list(self.samples.items()):
+            count, total = self.totals[stage]
+            values = np.fromiter(samples, dtype=np.float64)
+            p50, p95, p99 = np.percentile(values, [q * 100 for q in QUANTILES]) if len(values) else (0, 0, 0)
+            stages[stage] = {
+                "count": count,
+                "total_seconds": total,
+                "mean_seconds": total / count if count else 0.0,
+                "p50_seconds": float(p50),
+                "p95_seconds": float(p95),
+                "p99_seconds": float(p99)
+            }
+        return {
+            "started_at": self.started_at,
+            "frames_processed": self.frames_processed,
+            "pose_misses": self.pose_misses,
+            "pose_miss_rate": self.pose_misses / self.frames_processed if self.frames_processed else 0.0,
+            "stages": stages
+        }
+
+    def write_json(self, path, **labels):
+        """Write summary() (plus any labels, e.g. video=...) as JSON"""
+        _write_atomically(path, json.dumps(dict(labels, **self.summary()), indent=2) + "\n")
+
+    def write_prometheus(self, path, **labels):
+        """Write the metrics in Prometheus text format, e.g. for node_exporter's textfile collector"""
+        summary = self.summary()
+        base = "".join(f',{name}="{_escape(value)}"' for name, value in sorted(labels.items()))
+        plain = "{" + base[1:] + "}" if base else ""
+
+        lines = [
+            "# HELP jump_analysis_stage_seconds Latency of each analysis stage per frame.",
+            "# TYPE jump_analysis_stage_seconds summary"
+        ]
+        for stage, stats in sorted(summary["stages"].items()):
+            for quantile in QUANTILES:
+                value = stats[f"p{round(quantile * 100)}_seconds"]
+                lines.append(f'jump_analysis_stage_seconds{{stage="{stage}",quantile="{quantile}"{base}}} {value!r}')
+            lines.append(f'jump_analysis_stage_seconds_sum{{stage="{stage}"{base}}} {stats["total_seconds"]!r}')
+            lines.append(f'jump_analysis_stage_seconds_count{{stage="{stage}"{base}}} {stats["count"]}')
+        lines += [
+            "# HELP jump_analysis_frames_processed Frames Pose was run on in the last analysis.",
+            "# TYPE jump_analysis_frames_processed gauge",
+            f"jump_analysis_frames_processed{plain} {summary['frames_processed']}",
+            "# HELP jump_analysis_pose_misses Frames without a detected pose in the last analysis.",
+            "# TYPE jump_analysis_pose_misses gauge",
+            f"jump_analysis_pose_misses{plain} {summary['pose_misses']}",
+            "# HELP jump_analysis_pose_miss_ratio Share of frames without a detected pose.",
+            "# TYPE jump_analysis_pose_miss_ratio gauge",
+            f"jump_analysis_pose_miss_ratio{plain} {summary['pose_miss_rate']!r}",
+            "# HELP jump_analysis_started_timestamp_seconds When the last analysis started.",
+            "# TYPE jump_analysis_started_timestamp_seconds gauge",
+            f"jump_analysis_started_timestamp_seconds{plain} {summary['started_at']!r}"
+        ]
+        _write_atomically(path, "\n".join(lines) + "\n")
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _write_atomically(path, text):
+    """Write through a temporary file so scrapers never read a half-written file"""
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    temp_path = f"{path}.tmp"
+    with open(temp_path, "w") as f:
+        f.write(text)
+    os.replace(temp_path, path)
@@ -0,0 +1,85 @@
+import threading
+import numpy as np
+
+WARMUP_FRAME_SHAPE = (256, 256, 3)  # Blank frame run through new and recycled graphs
+
+
+class PosePool:
+    """Warmed-up MediaPipe Pose graphs shared between analyses, keyed by their settings.
+
+    Building a Pose graph and its first inference cost a few hundred
+    milliseconds and native memory that is only freed by close(), so
+    analyzers borrow a graph with acquire() and hand it back with release()
+    instead of building their own. A returned graph is reset (which drops
+    the previous video's tracking) and warmed up again with a blank frame on
+    a background thread; results afterwards match a freshly built graph.
+    mediapipe is only imported when the first graph is built.
+    """
+
+    def __init__(self, max_idle=2):
+        self.max_idle = max_idle  # Idle graphs kept per configuration
+        self.idle = {}  # config key -> [Pose]
+        self.recycling = {}  # config key -> graphs being reset
+        self.keys = {}  # id(Pose) -> config key of graphs handed out
+        self.closed = False
+        self.condition = threading.Condition()
+
+    @staticmethod
+    def _key(config):
+        return tuple(sorted(config.items()))
+
+    def acquire(self, **config):
+        """Return a warm Pose built with the given keyword arguments"""
+        key = self._key(config)
+        with self.condition:
+            # A graph being recycled is ready sooner than a new one would be
+            self.condition.wait_for(
+                lambda: self.closed or self.idle.get(key) or not self.recycling.get(key))
+            if self.closed:
+                raise RuntimeError("PosePool is closed")
+            pose = self.idle[key].pop() if self.idle.get(key) else None
+        if pose is None:
+            pose = self._create(config)
+        with self.condition:
+            self.keys[id(pose)] = key
+        return pose
+
+    def release(self, pose):
+        """Take back a graph from acquire(); it is reset and warmed up in the background"""
+        with self.condition:
+            key = self.keys.pop(id(pose))
+            self.recycling[key] = self.recycling.get(key, 0) + 1
+        threading.Thread(target=self._recycle, args=(key, pose), daemon=True).start()
+
+    def close(self):
+        """Close the idle graphs; graphs still in use are closed when released"""
+        with self.condition:
+            self.closed = True
+            idle, self.idle = self.idle, {}
+            self.condition.notify_all()
+        for poses in idle.values():
+            for pose in poses:
+                pose.close()
+
+    def _create(self, config):
+        import mediapipe as mp
+
+        pose = mp.solutions.pose.Pose(**config)
+        pose.process(np.zeros(WARMUP_FRAME_SHAPE, dtype=np.uint8))
+        return pose
+
+    def _recycle(self, key, pose):
+        keep = False
+        try:
+            pose.reset()
+            pose.process(np.zeros(WARMUP_FRAME_SHAPE, dtype=np.uint8))
+            with self.condition:
+                keep = not self.closed and len(self.idle.get(key, ())) < self.max_idle
+                if keep:
+                    self.idle.setdefault(key, []).append(pose)
+        finally:
+            with self.condition:
+                self.recycling[key] -= 1
+                self.condition.notify_all()
+            if not keep:
+                pose.close()
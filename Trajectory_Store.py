@@ -0,0 +1,109 @@
+import zlib
+import numpy as np
+
+LANDMARK_SCALE = 1 / 16384  # int16 landmark step; normalized coordinates fit in about ±2
+
+# How a saved height was scored, so re-scoring its trajectory can use the same method
+SCORED_BY_DETECTOR = "detector"  # Streaming JumpDetector; the trajectory ends at the landing
+SCORED_BY_FLIGHT_TIME = "flight_time"  # analyze_trajectory over the whole recording
+SCORED_BY_SEGMENTS = "segments"  # segment_jumps; one slice of a multi-jump recording
+
+CREATE_TRAJECTORY_TABLE = '''CREATE TABLE IF NOT EXISTS jump_trajectories (
+                        record_id INTEGER PRIMARY KEY,
+                        fps REAL NOT NULL,
+                        sample_count INTEGER NOT NULL,
+                        com_offset REAL NOT NULL,
+                        com_scale REAL NOT NULL,
+                        com BLOB NOT NULL,
+                        frame_indices BLOB NOT NULL,
+                        landmarks BLOB,
+                        scored_by TEXT,
+                        FOREIGN KEY(record_id) REFERENCES jump_records(id) ON DELETE CASCADE)'''
+
+
+def pack_trajectory(com_positions, frame_indices, landmarks=None):
+    """Encode a COM trajectory as compact zlib-compressed binary columns.
+
+    COM values are quantized to uint16 between their min and max, which keeps
+    the error far below a pixel. Frame indices are delta encoded, so the usual
+    run of consecutive frames compresses to almost nothing. Landmarks, if
+    given as an (n, 33, 4) array, are stored as int16 in steps of LANDMARK_SCALE.
+    Returns (sample_count, com_offset, com_scale, com, frame_indices, landmarks).
+    """
+    com = np.asarray(com_positions, dtype=np.float64)
+    com_offset = float(com.min()) if len(com) else 0.0
+    com_scale = float(com.max() - com_offset) / 65535 if len(com) else 0.0
+    if com_scale > 0:
+        quantized = np.rint((com - com_offset) / com_scale).astype(np.uint16)
+    else:
+        quantized = np.zeros(len(com), dtype=np.uint16)
+
+    deltas = np.diff(np.asarray(frame_indices, dtype=np.int32), prepend=0).astype(np.int32)
+
+    landmark_blob = None
+    if landmarks is not None:
+        landmarks = np.asarray(landmarks, dtype=np.float32).reshape(-1, 33, 4)
+        landmark_blob = zlib.compress(
+            np.clip(np.rint(landmarks / LANDMARK_SCALE), -32768, 32767).astype("<i2").tobytes())
+
+    return (len(com), com_offset, com_scale,
+            zlib.compress(quantized.astype("<u2").tobytes()),
+            zlib.compress(deltas.astype("<i4").tobytes()),
+            landmark_blob)
+
+
+def unpack_trajectory(sample_count, com_offset, com_scale, com, frame_indices, landmarks=None):
+    """Inverse of pack_trajectory: returns (com_positions, frame_indices, landmarks or None)"""
+    quantized = np.frombuffer(zlib.decompress(com), dtype="<u2", count=sample_count)
+    com_positions = quantized * com_scale + com_offset
+    indices = np.cumsum(np.frombuffer(zlib.decompress(frame_indices), dtype="<i4", count=sample_count))
+    if landmarks is not None:
+        landmarks = (np.frombuffer(zlib.decompress(landmarks), dtype="<i2")
+                     .reshape(-1, 33, 4).astype(np.float32) * LANDMARK_SCALE)
+    return com_positions, indices, landmarks
+
+
+def save_trajectory(cursor, record_id, com_positions, fps, frame_indices, scored_by=None, landmarks=None):
+    """Store the trajectory behind one jump_records row (inside the caller's transaction)"""
+    cursor.execute('''INSERT OR REPLACE INTO jump_trajectories
+                    (record_id, fps, sample_count, com_offset, com_scale, com, frame_indices, landmarks,
+                     scored_by)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)''',
+                   (record_id, fps) + pack_trajectory(com_positions, frame_indices, landmarks) + (scored_by,))
+
+
+def load_trajectory(cursor, record_id):
+    """Return (com_positions, fps, frame_indices, scored_by, landmarks) for a jump, or None if none was stored"""
+    cursor.execute('''SELECT fps, sample_count, com_offset, com_scale, com, frame_indices, landmarks, scored_by
+                    FROM jump_trajectories WHERE record_id=?''', (record_id,))
+    row = cursor.fetchone()
+    if row is None:
+        return None
+    com_positions, frame_indices, landmarks = unpack_trajectory(*row[1:7])
+    return com_positions, row[0], frame_indices, row[7], landmarks
+
+
+def slice_trajectories(com_positions, frame_indices, jumps):
+    """Split a multi-jump trajectory into one (com, frame_indices) piece per jump.
+
+    Pieces are cut halfway through the standing phase between neighbouring
+    jumps (or at the ends of the recording) and then trimmed so every jump
+    sits in the middle of its piece, with as much standing before its
+    takeoff as after its landing. The margin is never cut below the flight
+    time where the recording allows, which keeps the countermovement in.
+    """
+    frame_indices = np.asarray(frame_indices)
+    com_positions = np.asarray(com_positions)
+    pieces = []
+    for i, jump in enumerate(jumps):
+        start, end = frame_indices[0], frame_indices[-1] + 1
+        if i > 0:
+            start = (jumps[i - 1]["landing_frame"] + jump["takeoff_frame"]) // 2
+        if i + 1 < len(jumps):
+            end = (jump["landing_frame"] + jumps[i + 1]["takeoff_frame"]) // 2
+        flight = jump["landing_frame"] - jump["takeoff_frame"]
+        margin = max(min(jump["takeoff_frame"] - start, end - 1 - jump["landing_frame"]), flight)
+        mask = ((frame_indices >= max(start, jump["takeoff_frame"] - margin))
+                & (frame_indices < min(end, jump["landing_frame"] + margin + 1)))
+        pieces.append((com_positions[mask], frame_indices[mask]))
+    return pieces
@@ -1,20 +1,173 @@
+import math
 import sys
+import time
+STARTUP_TIME = time.perf_counter()  # Taken before the Qt imports so startup time includes them
 import sqlite3
-from PyQt6.QtWidgets import QApplication, QProgressBar, QSizePolicy, QWidget, QVBoxLayout, QLineEdit, QPushButton, QLabel, QFileDialog, QTableWidget, QTableWidgetItem, QTabWidget, QHBoxLayout, QStackedWidget, QSpinBox
-from PyQt6.QtCore import Qt, QMargins
-from datetime import datetime
+import threading
+import numpy as np
+from PyQt6.QtWidgets import QApplication, QCheckBox, QComboBox, QProgressBar, QSizePolicy, QWidget, QVBoxLayout, QLineEdit, QPushButton, QLabel, QFileDialog, QTableView, QTabWidget, QHBoxLayout, QStackedWidget, QSpinBox
+from PyQt6.QtCore import Qt, QMargins, QPointF
 #import random
 #from PyQt6 import QtCharts
 from PyQt6.QtCharts import QChart, QChartView, QLineSeries, QValueAxis
-from PyQt6.QtGui import QPainter, QImage, QPixmap
+from PyQt6.QtGui import QPainter, QImage
 import os
 from PyQt6.QtWidgets import QSplitter
 from PyQt6.QtWidgets import QHeaderView
 from PyQt6.QtWidgets import QInputDialog
-import mediapipe as mp
-import cv2
-from PyQt6.QtCore import QTimer
-from Jump_Analyzer import *
+from PyQt6.QtCore import QObject, QTimer, pyqtSignal
+# Jump_Analyzer, Video_Pipeline and Live_Capture pull in mediapipe and OpenCV, so
+# they are imported where first needed (normally by AnalyzerWarmup after sign-in)
+from Trajectory_Store import SCORED_BY_DETECTOR, SCORED_BY_FLIGHT_TIME, SCORED_BY_SEGMENTS, slice_trajectories
+from Jump_Database import JumpDatabase
+from Pipeline_Metrics import PipelineMetrics
+from Pose_Pool import PosePool
+from History_Model import DELETE_COLUMN, HEIGHT_COLUMN, RECORD_ID_ROLE, DeleteButtonDelegate, JumpHistoryModel, lttb_indices
+
+HISTORY_CHART_MAX_POINTS = 500  # Longer histories (or zoom windows) are downsampled with LTTB
+HISTORY_CHART_ANIMATION_MAX_POINTS = 100
+DEFAULT_PREVIEW_RATE = 10  # Hz; in max speed mode analysis runs ahead of the preview
+METRICS_DIR = "metrics"  # Stage timings of the last analysis, as JSON and Prometheus text
+
+class AnalysisWorker(QObject):
+    """Runs a VideoPipeline off the GUI thread and reports back through signals"""
+    frame_ready = pyqtSignal(object)  # Letterboxed BGR preview, valid until frame_displayed()
+    progress = pyqtSignal(object)  # ProgressReport, a few times per second
+    finished = pyqtSignal(list, float, list, object)  # com, fps, frame indices, early-stop height
+    failed = pyqtSignal(str)
+
+    def __init__(self, analyzer, video_path, preview_size, stop_at_landing=False,
+                 preview_rate=None, realtime=False, parent=None):
+        super().__init__(parent)
+        from Video_Pipeline import VideoPipeline
+        self.pipeline = VideoPipeline(
+            analyzer,
+            video_path,
+            preview_size=preview_size,
+            stop_at_landing=stop_at_landing,
+            preview_rate=preview_rate,
+            realtime=realtime,
+            on_frame=self.frame_ready.emit,
+            on_progress=self.progress.emit,
+            on_finished=self.finished.emit,
+            on_error=self.failed.emit
+        )
+
+    def frame_displayed(self):
+        self.pipeline.frame_displayed()
+
+    def start(self):
+        self.pipeline.start()
+
+    def pause(self):
+        self.pipeline.pause()
+
+    def resume(self):
+        self.pipeline.resume()
+
+    def is_paused(self):
+        return self.pipeline.is_paused()
+
+    def cancel(self):
+        self.pipeline.cancel()
+
+    def wait(self, timeout=None):
+        return self.pipeline.wait(timeout)
+
+class LiveWorker(QObject):
+    """Runs a LiveJumpSession and reports detected jumps through signals"""
+    jump_detected = pyqtSignal(float)  # Height in meters
+    event = pyqtSignal(str)
+    progress = pyqtSignal(object)  # ProgressReport with analysis fps and dropped frames
+    failed = pyqtSignal(str)
+
+    def __init__(self, analyzer, source, parent=None):
+        super().__init__(parent)
+        from Live_Capture import LiveJumpSession
+        self.session = LiveJumpSession(
+            analyzer,
+            source,
+            on_jump=self.jump_detected.emit,
+            on_event=self.event.emit,
+            on_error=self.failed.emit,
+            on_progress=self.progress.emit
+        )
+
+    @property
+    def ring_buffer(self):
+        return self.session.ring_buffer
+
+    def start(self):
+        self.session.start()
+
+    def stop(self):
+        self.session.stop()
+
+    def wait(self, timeout=None):
+        return self.session.wait(timeout)
+
+class AnalyzerWarmup(QObject):
+    """Imports the analysis stack and warms a Pose graph into the pool on a background thread.
+
+    Building the Pose graph and its first inference take a good part of a
+    second, so this runs right after sign-in and the first analysis finds
+    the model hot.
+    """
+    ready = pyqtSignal(float)  # Seconds taken
+    failed = pyqtSignal(str)
+
+    def __init__(self, pose_pool, settings, parent=None):
+        super().__init__(parent)
+        self.pose_pool = pose_pool
+        self.settings = settings  # JumpAnalyzer keyword arguments
+
+    def start(self):
+        threading.Thread(target=self._run, daemon=True).start()
+
+    def _run(self):
+        start = time.perf_counter()
+        try:
+            from Jump_Analyzer import JumpAnalyzer
+            import Video_Pipeline  # Imported here too, so the first analysis does not wait for it
+            # The pool builds and warms the graph; closing puts it back for the first upload
+            JumpAnalyzer(pose_pool=self.pose_pool, **self.settings).close()
+        except Exception as e:
+            self.failed.emit(str(e))
+            return
+        self.ready.emit(time.perf_counter() - start)
+
+class PreviewLabel(QLabel):
+    """Label that paints BGR preview frames directly, without a QPixmap per frame"""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.frame = None  # Keeps the buffer behind self.image alive
+        self.image = None
+        self.metrics = None  # Records paint time as the "display" stage when set
+
+    def set_frame(self, frame):
+        h, w, ch = frame.shape
+        self.frame = frame
+        self.image = QImage(frame.data, w, h, ch * w, QImage.Format.Format_BGR888)
+        self.update()
+
+    def setText(self, text):
+        self.frame = self.image = None
+        super().setText(text)
+
+    def paintEvent(self, event):
+        if self.image is None:
+            super().paintEvent(event)
+            return
+        start = time.perf_counter() if self.metrics is not None else 0.0
+        painter = QPainter(self)
+        painter.fillRect(self.rect(), Qt.GlobalColor.black)
+        # Frames are already letterboxed to the label size; center in case it changed
+        painter.drawImage((self.width() - self.image.width()) // 2,
+                          (self.height() - self.image.height()) // 2, self.image)
+        painter.end()
+        if self.metrics is not None:
+            self.metrics.record("display", time.perf_counter() - start)
 
 class JumpHeightApp(QWidget):
     def __init__(self):
@@ -57,7 +210,7 @@ class JumpHeightApp(QWidget):
             }
             
             /* Tables */
-            QTableWidget {
+            QTableView {
                 background-color: white;
                 color: #333333;
                 border: 1px solid #DDDDDD;
@@ -122,9 +275,21 @@ class JumpHeightApp(QWidget):
         self.current_video_path = None
         self.current_user = None
         self.jump_analyzer = None 
+        self.analysis_worker = None
+        self.multi_jump_mode = False
+        self.live_worker = None
+        self.analyzer_warmup = None
+        self.pose_pool = PosePool()  # Pose graphs shared by all analyses; nothing is loaded until used
+        self.history_ids = []  # Record ids of all jumps, oldest first
+        self.history_heights = []  # Full-resolution chart data, parallel to history_ids
+        self.live_sequence = -1  # Last ring buffer frame shown in the live preview
+        self.live_preview_timer = QTimer(self)
+        self.live_preview_timer.setInterval(33)
+        self.live_preview_timer.timeout.connect(self.update_live_preview)
         self.current_frame = None
 
         # Initialize Database
+        self.database = JumpDatabase()
         self.initialize_database()
 
         # Create the stacked widget to handle screen transitions
@@ -143,34 +308,7 @@ class JumpHeightApp(QWidget):
 
     def initialize_database(self):
         """Create or update database with proper schema."""
-        conn = sqlite3.connect("users.db")
-        cursor = conn.cursor()
-        
-        # Create tables if they don't exist
-        cursor.execute('''CREATE TABLE IF NOT EXISTS users (
-                        email TEXT PRIMARY KEY, 
-                        password TEXT)''')
-        
-        # Check if height column exists, add if not
-        cursor.execute("PRAGMA table_info(users)")
-        columns = [column[1] for column in cursor.fetchall()]
-        if 'height' not in columns:
-            cursor.execute("ALTER TABLE users ADD COLUMN height INTEGER DEFAULT 72")  # Default to 72 inches
-        
-        # Create jump records table (unchanged)
-        cursor.execute('''CREATE TABLE IF NOT EXISTS jump_records (
-                        id INTEGER PRIMARY KEY AUTOINCREMENT,
-                        email TEXT NOT NULL,
-                        date TEXT NOT NULL,
-                        jump_height REAL NOT NULL,
-                        FOREIGN KEY(email) REFERENCES users(email))''')
-        
-        # Create index for faster queries
-        cursor.execute('''CREATE INDEX IF NOT EXISTS idx_email 
-                        ON jump_records(email)''')
-        
-        conn.commit()
-        conn.close()
+        self.database.initialize()
 
     def setup_welcome_screen(self):
         """Set up the welcome screen with sign-in and sign-up."""
@@ -286,7 +424,7 @@ class JumpHeightApp(QWidget):
         container_layout.setContentsMargins(0, 0, 0, 0)
         
         # The video label that will hold the pixmap
-        self.video_label = QLabel()
+        self.video_label = PreviewLabel()
         self.video_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
         self.video_label.setSizePolicy(QSizePolicy.Policy.Ignored, QSizePolicy.Policy.Ignored)
         
@@ -310,11 +448,74 @@ class JumpHeightApp(QWidget):
         self.upload_button = QPushButton("Upload Video")
         self.upload_button.clicked.connect(self.upload_video)
         
+        self.live_button = QPushButton("Live Camera")
+        self.live_button.clicked.connect(self.toggle_live_capture)
+        
         button_layout.addWidget(self.upload_button)
         button_layout.addWidget(self.play_pause_button)
+        button_layout.addWidget(self.live_button)
+        
+        # Analysis options (the preview size is independent of these)
+        options_layout = QHBoxLayout()
+        self.roi_checkbox = QCheckBox("Track athlete (crop to ROI)")
+        self.roi_checkbox.setToolTip("Run pose detection on a crop around the athlete instead of the full frame")
+        
+        self.inference_resolution_combo = QComboBox()
+        for label, inference_height in [("Full resolution", None), ("720p", 720),
+                                        ("540p", 540), ("360p", 360)]:
+            self.inference_resolution_combo.addItem(label, inference_height)
+        self.inference_resolution_combo.setToolTip("Resolution frames are downscaled to before pose detection")
+        
+        self.stop_at_landing_checkbox = QCheckBox("Stop at landing")
+        self.stop_at_landing_checkbox.setChecked(True)
+        self.stop_at_landing_checkbox.setToolTip("Report the height as soon as the landing is detected")
+        
+        self.multi_jump_checkbox = QCheckBox("Multiple jumps")
+        self.multi_jump_checkbox.setToolTip("Find and save every jump in a recording of several jumps")
+        self.multi_jump_checkbox.toggled.connect(
+            lambda checked: self.stop_at_landing_checkbox.setEnabled(not checked))
+        
+        options_layout.addWidget(self.roi_checkbox)
+        options_layout.addWidget(self.stop_at_landing_checkbox)
+        options_layout.addWidget(self.multi_jump_checkbox)
+        
+        self.live_file_checkbox = QCheckBox("Use video file as camera")
+        self.live_file_checkbox.setToolTip("Play a recorded video in real time instead of opening the camera")
+        options_layout.addWidget(self.live_file_checkbox)
+        options_layout.addStretch()
+        options_layout.addWidget(QLabel("Analysis resolution:"))
+        options_layout.addWidget(self.inference_resolution_combo)
+        
+        # Playback speed and how often the preview is refreshed
+        playback_layout = QHBoxLayout()
+        self.playback_mode_combo = QComboBox()
+        self.playback_mode_combo.addItem("Max speed", False)
+        self.playback_mode_combo.addItem("Real time", True)
+        self.playback_mode_combo.setToolTip("Analyze as fast as possible, or play at the video's frame rate")
+        
+        self.preview_rate_spinbox = QSpinBox()
+        self.preview_rate_spinbox.setRange(1, 60)
+        self.preview_rate_spinbox.setValue(DEFAULT_PREVIEW_RATE)
+        self.preview_rate_spinbox.setSuffix(" Hz")
+        self.preview_rate_spinbox.setToolTip("How often the preview shows the latest analyzed frame")
+        # Real time playback shows every frame
+        self.playback_mode_combo.currentIndexChanged.connect(
+            lambda: self.preview_rate_spinbox.setEnabled(not self.playback_mode_combo.currentData()))
+        
+        playback_layout.addWidget(QLabel("Playback:"))
+        playback_layout.addWidget(self.playback_mode_combo)
+        playback_layout.addWidget(QLabel("Preview rate:"))
+        playback_layout.addWidget(self.preview_rate_spinbox)
+        playback_layout.addStretch()
+        
+        self.metrics_checkbox = QCheckBox("Record timing metrics")
+        self.metrics_checkbox.setToolTip(f"Write per-stage timings of each analysis to {METRICS_DIR}/")
+        playback_layout.addWidget(self.metrics_checkbox)
         
         controls_layout.addWidget(self.progress_bar)
         controls_layout.addLayout(button_layout)
+        controls_layout.addLayout(options_layout)
+        controls_layout.addLayout(playback_layout)
         
         # Results display with card styling
         results_card = QWidget()
@@ -501,36 +702,16 @@ class JumpHeightApp(QWidget):
         stats_layout.setContentsMargins(0, 0, 0, 0)
         stats_layout.setSpacing(15)
         
-        # Best jump card
-        best_card = QWidget()
-        best_card.setStyleSheet("background: white; border-radius: 6px; border: 1px solid #e0e0e0;")
-        best_layout = QVBoxLayout(best_card)
-        best_layout.setContentsMargins(15, 10, 15, 10)
-        
-        best_title = QLabel("Best Jump")
-        best_title.setStyleSheet("font-weight: bold; color: #4a6fa5;")
-        self.best_jump_label = QLabel("--")
-        self.best_jump_label.setStyleSheet("font-size: 16px;")
-        
-        best_layout.addWidget(best_title)
-        best_layout.addWidget(self.best_jump_label)
-        
-        # Average jump card
-        avg_card = QWidget()
-        avg_card.setStyleSheet("background: white; border-radius: 6px; border: 1px solid #e0e0e0;")
-        avg_layout = QVBoxLayout(avg_card)
-        avg_layout.setContentsMargins(15, 10, 15, 10)
-        
-        avg_title = QLabel("Average Jump")
-        avg_title.setStyleSheet("font-weight: bold; color: #4a6fa5;")
-        self.average_jump_label = QLabel("--")
-        self.average_jump_label.setStyleSheet("font-size: 16px;")
-        
-        avg_layout.addWidget(avg_title)
-        avg_layout.addWidget(self.average_jump_label)
+        # Statistics cards, filled from the jump_stats summary by update_statistics()
+        best_card, self.best_jump_label = self.create_stat_card("Best Jump")
+        avg_card, self.average_jump_label = self.create_stat_card("Average Jump")
+        count_card, self.jump_count_label = self.create_stat_card("Jumps")
+        recent_card, self.recent_best_label = self.create_stat_card("Best (30 Days)")
         
         stats_layout.addWidget(best_card)
         stats_layout.addWidget(avg_card)
+        stats_layout.addWidget(count_card)
+        stats_layout.addWidget(recent_card)
         stats_layout.addStretch()
         
         layout.addWidget(stats_container)
@@ -539,26 +720,33 @@ class JumpHeightApp(QWidget):
         splitter = QSplitter(Qt.Orientation.Vertical)
         
         # Data Table with improved styling
-        self.data_table = QTableWidget()
-        self.data_table.setColumnCount(3)
-        self.data_table.setHorizontalHeaderLabels(["Date", "Height (inches)", "Delete"])
+        # Rows are paged in from the database as the table scrolls
+        self.history_model = JumpHistoryModel(self.database, parent=self)
+        self.delete_delegate = DeleteButtonDelegate(self)
+        self.delete_delegate.delete_requested.connect(self.delete_entry)
+        self.data_table = QTableView()
+        self.data_table.setModel(self.history_model)
+        self.data_table.setItemDelegateForColumn(DELETE_COLUMN, self.delete_delegate)
+        self.data_table.setMouseTracking(True)  # Hover highlight on the delete buttons
+        self.data_table.setSelectionBehavior(QTableView.SelectionBehavior.SelectRows)
         self.data_table.horizontalHeader().setSectionResizeMode(0, QHeaderView.ResizeMode.ResizeToContents)
         self.data_table.horizontalHeader().setSectionResizeMode(1, QHeaderView.ResizeMode.ResizeToContents)
         self.data_table.horizontalHeader().setSectionResizeMode(2, QHeaderView.ResizeMode.Fixed)
         self.data_table.setColumnWidth(2, 200)
         self.data_table.verticalHeader().setVisible(False)
+        self.data_table.doubleClicked.connect(self.show_stored_trajectory)
         self.data_table.setStyleSheet("""
-            QTableWidget {
+            QTableView {
                 border: 1px solid #e0e0e0;
                 border-radius: 6px;
                 background: white;
                 gridline-color: #e0e0e0;
                 alternate-background-color: #f9f9f9;
             }
-            QTableWidget::item {
+            QTableView::item {
                 padding: 5px;
             }
-            QTableWidget::item:selected {
+            QTableView::item:selected {
                 background-color: #e1f0ff;
                 color: black;
             }
@@ -568,6 +756,8 @@ class JumpHeightApp(QWidget):
         self.chart_view = QChartView()
         self.chart_view.setRenderHint(QPainter.RenderHint.Antialiasing)
         self.chart_view.setStyleSheet("background: white; border-radius: 6px; border: 1px solid #e0e0e0;")
+        # Drag to zoom into a range of attempts, right-click to zoom back out
+        self.chart_view.setRubberBand(QChartView.RubberBand.HorizontalRubberBand)
         
         splitter.addWidget(self.data_table)
         splitter.addWidget(self.chart_view)
@@ -575,19 +765,28 @@ class JumpHeightApp(QWidget):
         
         layout.addWidget(splitter)
         self.view_data_tab.setLayout(layout)
+        self.create_jump_history_chart()
     
-    def create_jump_history_chart(self, jump_data):
+    def create_stat_card(self, title):
+        """Return a statistics card widget and the label that shows its value"""
+        card = QWidget()
+        card.setStyleSheet("background: white; border-radius: 6px; border: 1px solid #e0e0e0;")
+        card_layout = QVBoxLayout(card)
+        card_layout.setContentsMargins(15, 10, 15, 10)
+        
+        title_label = QLabel(title)
+        title_label.setStyleSheet("font-weight: bold; color: #4a6fa5;")
+        value_label = QLabel("--")
+        value_label.setStyleSheet("font-size: 16px;")
+        
+        card_layout.addWidget(title_label)
+        card_layout.addWidget(value_label)
+        return card, value_label
+
+    def create_jump_history_chart(self):
+        """Build the history chart once; data changes only replace its points."""
         series = QLineSeries()
         
-        # Handle both (id, date, height) and (date, height) formats
-        for attempt, record in enumerate(jump_data):
-            if len(record) == 3:  # If (id, date, height)
-                date, height = record[1], record[2]
-            else:  # If (date, height)
-                date, height = record[0], record[1]
-                
-            series.append(attempt, float(height))
-        
         chart = QChart()
         chart.addSeries(series)
         chart.setTitle("")
@@ -607,54 +806,69 @@ class JumpHeightApp(QWidget):
         chart.addAxis(axis_y, Qt.AlignmentFlag.AlignLeft)
         series.attachAxis(axis_x)
         series.attachAxis(axis_y)
-        # In create_jump_history_chart():
-        chart.setAnimationOptions(QChart.AnimationOption.SeriesAnimations)  # Add animation
+        # Zooming changes the x range; reload the points for the new window
+        axis_x.rangeChanged.connect(self.refresh_history_chart)
+        self.history_chart, self.history_series = chart, series
+        self.history_axis_x, self.history_axis_y = axis_x, axis_y
         #series.setPointsVisible(True)  # Show data points
         #series.setPointLabelsVisible(True)  # Show values on points
         #series.setPointLabelsFormat("@yPoint inches")  # Format labels
         
         self.chart_view.setChart(chart)
 
-    def update_jump_statistics(self, jump_data):
-        """Update the best and average jump height labels."""
-        # Extract jump heights from the jump data
-        heights = [data[1] for data in jump_data]
-
-        # If there are heights, calculate best and average jumps
+    def update_history_chart(self):
+        """Fit the axes to the full history (unless zoomed in) and redraw the points"""
+        if not self.history_chart.isZoomed():
+            self.fit_history_axes()
+        self.refresh_history_chart()
+
+    def fit_history_axes(self):
+        heights = self.history_heights
+        self.history_axis_x.blockSignals(True)  # Not a zoom, the caller redraws
+        self.history_axis_x.setRange(0, max(1, len(heights) - 1))
+        self.history_axis_x.blockSignals(False)
         if heights:
-            best_jump = max(heights)  # Find the highest jump
-            average_jump = sum(heights) / len(heights)  # Calculate average jump height
-        else:
-            best_jump = 0
-            average_jump = 0
-
-        # Update the labels to reflect best and average jumps
-        self.best_jump_label.setText(f"Best Jump: {best_jump} inches")
-        self.average_jump_label.setText(f"Average Jump: {average_jump:.2f} inches")
+            # Pad so equal heights still get a visible span and the extremes stay off the border
+            lo, hi = min(heights), max(heights)
+            pad = max(1.0, 0.05 * (hi - lo))
+            self.history_axis_y.setRange(lo - pad, hi + pad)
+
+    def refresh_history_chart(self):
+        """Show the points in the visible range, downsampled if there are too many.
+        
+        Zooming into a narrow window therefore brings back every jump in it.
+        """
+        count = len(self.history_heights)
+        first = max(0, math.floor(self.history_axis_x.min()) - 1)  # One point past each edge
+        last = min(count, math.ceil(self.history_axis_x.max()) + 2)
+        attempts = np.arange(first, last)
+        heights = np.asarray(self.history_heights[first:last], dtype=np.float64)
+        keep = lttb_indices(attempts, heights, HISTORY_CHART_MAX_POINTS)
+        
+        self.history_chart.setAnimationOptions(
+            QChart.AnimationOption.SeriesAnimations if len(keep) <= HISTORY_CHART_ANIMATION_MAX_POINTS
+            else QChart.AnimationOption.NoAnimation
+        )
+        self.history_series.replace([QPointF(attempts[i], heights[i]) for i in keep.tolist()])
 
-    def save_jump_data(self, jump_height):
+    def save_jump_data(self, jump_height, trajectory=None):
         """Save jump record to database."""
+        self.save_jump_records([jump_height], [trajectory])
+
+    def save_jump_records(self, jump_heights, trajectories=None):
+        """Save several jump records to the database in one transaction.
+        
+        trajectories optionally holds a (com_positions, fps, frame_indices,
+        scored_by) tuple (or None) per jump, stored alongside its record.
+        """
         if not hasattr(self, "current_user"):
             return
 
         try:
-            conn = sqlite3.connect("users.db")
-            conn.execute("PRAGMA foreign_keys = ON")
-            cursor = conn.cursor()
-            
-            current_date = datetime.now().strftime("%m/%d/%Y %I:%M:%S %p")
-            cursor.execute('''INSERT INTO jump_records 
-                            (email, date, jump_height)
-                            VALUES (?, ?, ?)''',
-                        (self.current_user, current_date, jump_height))
-            
-            conn.commit()
-            self.load_user_data()  # Refresh display
-            
+            records = self.database.add_jumps(self.current_user, jump_heights, trajectories)
+            self.add_history_records(records)  # Refresh display
         except sqlite3.Error as e:
             print(f"Database error: {e}")
-        finally:
-            conn.close()
 
 
     def sign_in(self):
@@ -663,31 +877,20 @@ class JumpHeightApp(QWidget):
         password = self.password_input.text().strip()
 
         try:
-            conn = sqlite3.connect("users.db")
-            cursor = conn.cursor()
-            cursor.execute('''SELECT height FROM users 
-                            WHERE email=? AND password=?''',
-                        (email, password))
-            result = cursor.fetchone()
-            
-            if result:
+            if self.database.authenticate(email, password):
                 self.current_user = email
                 self.load_user_data()
                 self.load_user_height()
                 self.stacked_widget.setCurrentWidget(self.home_screen)
+                self.warm_up_analyzer()
             else:
                 self.show_message("Error", "Invalid email or password")
         except sqlite3.Error as e:
             self.show_message("Database Error", str(e))
-        finally:
-            conn.close()
 
     def logout(self):
         """Clean up resources"""
-        if hasattr(self, 'cap') and self.cap.isOpened():
-            self.cap.release()
-        if hasattr(self, 'timer'):
-            self.timer.stop()
+        self.cleanup_video_resources()
         """Clear user session and return to welcome screen."""
         self.current_user = None
         self.email_input.clear()
@@ -695,9 +898,15 @@ class JumpHeightApp(QWidget):
         self.stacked_widget.setCurrentWidget(self.welcome_screen)
         
         # Clear any displayed data
-        self.data_table.setRowCount(0)
-        self.best_jump_label.setText("Best Jump: --")
-        self.average_jump_label.setText("Average Jump: --")
+        self.history_model.load(None)
+        self.update_statistics()
+
+    def closeEvent(self, event):
+        """Stop any analysis and close the Pose graphs and the database on exit"""
+        self.cleanup_video_resources()
+        self.pose_pool.close()
+        self.database.close()
+        super().closeEvent(event)
 
     def sign_up(self):
         """Register a new user with height information."""
@@ -715,23 +924,13 @@ class JumpHeightApp(QWidget):
         if not ok:
             return  # User cancelled
 
-        conn = sqlite3.connect("users.db")
-        cursor = conn.cursor()
         try:
-            cursor.execute("SELECT 1 FROM users WHERE email=?", (email,))
-            if cursor.fetchone():
-                self.show_message("Error", "Email already registered.")
-            else:
-                cursor.execute(
-                    "INSERT INTO users (email, password, height) VALUES (?, ?, ?)",
-                    (email, password, height)
-                )
-                conn.commit()
+            if self.database.create_user(email, password, height):
                 self.show_message("Success", "Account created! You can now sign in.")
+            else:
+                self.show_message("Error", "Email already registered.")
         except sqlite3.Error as e:
             self.show_message("Database Error", str(e))
-        finally:
-            conn.close()
 
     def upload_video(self):
         """Handle video upload and store path."""
@@ -750,138 +949,258 @@ class JumpHeightApp(QWidget):
 
     def calculate_jump_height(self):
         self.progress_bar.setValue(0)
+        self.progress_bar.setFormat("%p%")
         if not hasattr(self, 'current_video_path'):
             self.result_label.setText("Error: No video provided")
             return
 
-        # Get user's height from database
         try:
-            conn = sqlite3.connect("users.db")
-            cursor = conn.cursor()
-            cursor.execute("SELECT height FROM users WHERE email=?", (self.current_user,))
-            user_height_inches = cursor.fetchone()[0]
-            user_height_meters = user_height_inches * 0.0254  # Convert to meters
-            conn.close()
-            
-            # Initialize analyzer
-            self.jump_analyzer = JumpAnalyzer(user_height_meters)
-            
-            # Setup video capture
-            self.cap = cv2.VideoCapture(self.current_video_path)
-            self.timer = QTimer()
-            self.timer.timeout.connect(self.process_next_frame)
-            self.timer.start(30)  # ~30fps
+            # Decode, inference and rendering run on worker threads
+            self.cleanup_video_resources()
+            self.jump_analyzer = self.create_jump_analyzer()
+            self.multi_jump_mode = self.multi_jump_checkbox.isChecked()
+            self.video_label.metrics = self.jump_analyzer.metrics
+            realtime = self.playback_mode_combo.currentData()
+            self.analysis_worker = AnalysisWorker(
+                self.jump_analyzer,
+                self.current_video_path,
+                (self.video_label.width(), self.video_label.height()),
+                stop_at_landing=self.stop_at_landing_checkbox.isChecked() and not self.multi_jump_mode,
+                preview_rate=None if realtime else self.preview_rate_spinbox.value(),
+                realtime=realtime
+            )
+            self.analysis_worker.frame_ready.connect(self.display_frame)
+            # Runs after display_frame; lets the pipeline render its next preview
+            self.analysis_worker.frame_ready.connect(self.analysis_worker.frame_displayed)
+            self.analysis_worker.progress.connect(self.update_processing_progress)
+            self.analysis_worker.finished.connect(self.finish_processing)
+            self.analysis_worker.failed.connect(self.processing_failed)
+            self.analysis_worker.start()
+            self.play_pause_button.setText("Pause")
             
             self.result_label.setText("Processing video...")
-            self.com_positions = []
             
         except Exception as e:
             self.result_label.setText(f"Error: {str(e)}")
 
 
+    def analyzer_settings(self):
+        """JumpAnalyzer keyword arguments for the current user and the selected options"""
+        # Get user's height from database
+        user_height_inches = self.database.get_height(self.current_user)
+        user_height_meters = user_height_inches * 0.0254  # Convert to meters
+        
+        return {
+            "person_height_meters": user_height_meters,
+            "roi_tracking": self.roi_checkbox.isChecked(),
+            "inference_height": self.inference_resolution_combo.currentData()
+        }
+
+    def create_jump_analyzer(self):
+        """Build a JumpAnalyzer for the current user around a pooled Pose graph"""
+        from Jump_Analyzer import JumpAnalyzer
+        return JumpAnalyzer(
+            pose_pool=self.pose_pool,
+            metrics=PipelineMetrics() if self.metrics_checkbox.isChecked() else None,
+            **self.analyzer_settings()
+        )
+
+    def warm_up_analyzer(self):
+        """Load MediaPipe and build a hot JumpAnalyzer in the background"""
+        try:
+            settings = self.analyzer_settings()
+        except (sqlite3.Error, TypeError) as e:
+            print(f"Skipping analyzer warm-up: {e}")
+            return
+        self.analyzer_warmup = AnalyzerWarmup(self.pose_pool, settings)
+        self.analyzer_warmup.ready.connect(self.analyzer_warmed_up)
+        self.analyzer_warmup.failed.connect(lambda error: print(f"Analyzer warm-up failed: {error}"))
+        self.analyzer_warmup.start()
+
+    def analyzer_warmed_up(self, seconds):
+        self.analyzer_warmup = None
+        print(f"Startup: analyzer ready {seconds:.2f}s after sign-in")
+
+    def toggle_live_capture(self):
+        """Start or stop measuring jumps from the camera"""
+        if self.live_worker is not None:
+            self.stop_live_capture()
+            return
+        
+        source = 0
+        if self.live_file_checkbox.isChecked():
+            source, _ = QFileDialog.getOpenFileName(
+                self,
+                "Open Video File",
+                "",
+                "Video Files (*.mp4 *.avi *.mov);;All Files (*)"
+            )
+            if not source:
+                return
+        
+        try:
+            self.cleanup_video_resources()
+            self.jump_analyzer = self.create_jump_analyzer()
+            self.live_worker = LiveWorker(self.jump_analyzer, source)
+        except Exception as e:
+            self.result_label.setText(f"Error: {str(e)}")
+            return
+        
+        from Video_Pipeline import PreviewRenderer
+        self.live_renderer = PreviewRenderer((self.video_label.width(), self.video_label.height()))
+        self.live_worker.jump_detected.connect(self.live_jump_detected)
+        self.live_worker.event.connect(lambda event: self.upload_label.setText(f"Live: {event}"))
+        self.live_worker.failed.connect(self.live_capture_failed)
+        self.live_worker.progress.connect(self.update_processing_progress)
+        self.progress_bar.setValue(0)
+        self.progress_bar.setFormat("%p%")
+        self.live_worker.start()
+        self.live_preview_timer.start()
+        self.live_button.setText("Stop Live")
+        self.upload_label.setText("Live: waiting for jump")
+        self.result_label.setText("Jump when ready")
+
+    def stop_live_capture(self):
+        """Stop the live session; returns False if its threads did not exit in time"""
+        self.live_preview_timer.stop()
+        stopped = True
+        if self.live_worker is not None:
+            self.live_worker.stop()
+            stopped = self.live_worker.wait(1.0)
+            self.live_worker = None
+            if stopped:
+                self.jump_analyzer.close()
+        self.live_sequence = -1
+        self.live_button.setText("Live Camera")
+        return stopped
+
+    def update_live_preview(self):
+        """Show the newest captured frame straight from the capture ring buffer"""
+        if self.live_worker is None:
+            return
+        ring_buffer = self.live_worker.ring_buffer
+        latest = ring_buffer.acquire_latest(self.live_sequence, timeout=0)
+        if latest is None:
+            if ring_buffer.closed:
+                self.stop_live_capture()  # Camera disconnected or video file ended
+            return
+        
+        slot, self.live_sequence, _, frame = latest
+        try:
+            # Resizing writes into the renderer's own buffer, so the slot can be released afterwards
+            preview = self.live_renderer.render(frame)
+        finally:
+            ring_buffer.release(slot)
+        self.display_frame(preview)
+
+    def live_jump_detected(self, jump_height_meters):
+        jump_height_inches = jump_height_meters * 39.37
+        self.save_jump_data(jump_height_inches)
+        self.result_label.setText(f"Jump Height: {jump_height_inches:.1f} inches")
+        self.upload_label.setText("Live: waiting for next jump")
+
+    def live_capture_failed(self, error):
+        print(f"Live capture error: {error}")
+        self.stop_live_capture()
+        self.show_error_message()
+
     def load_user_data(self):
-        """Load data with delete buttons for each row."""
+        """Rebuild the whole history view (table, stats and chart); used at sign-in."""
         if not hasattr(self, "current_user"):
             return
 
         try:
-            conn = sqlite3.connect("users.db")
-            cursor = conn.cursor()
-            # Get data in chronological order for the chart
-            cursor.execute('''SELECT date, jump_height FROM jump_records 
-                            WHERE email=? ORDER BY date ASC''',  # Changed to ASC
-                        (self.current_user,))
-            chart_data = cursor.fetchall()
-            
-            # Get data in reverse order for the table (most recent first)
-            cursor.execute('''SELECT id, date, jump_height FROM jump_records 
-                            WHERE email=? ORDER BY date DESC''',
-                        (self.current_user,))
-            table_data = cursor.fetchall()
-            
-            self.data_table.setRowCount(len(table_data))
-            for row, (record_id, date, height) in enumerate(table_data):
-                # Date column
-                date_item = QTableWidgetItem(date)
-                date_item.setFlags(date_item.flags() ^ Qt.ItemFlag.ItemIsEditable)
-                self.data_table.setItem(row, 0, date_item)
-                
-                # Height column (ensure it's stored as float)
-                try:
-                    height_float = float(height)
-                    height_item = QTableWidgetItem(f"{height_float:.1f}")
-                except (ValueError, TypeError):
-                    height_item = QTableWidgetItem("N/A")
-                    
-                height_item.setFlags(height_item.flags() ^ Qt.ItemFlag.ItemIsEditable)
-                self.data_table.setItem(row, 1, height_item)
-                
-                # Delete button
-                delete_btn = QPushButton("Delete")
-                delete_btn.setStyleSheet("padding: none;")
-                delete_btn.clicked.connect(lambda _, r=row, id=record_id: self.delete_entry(r, id))
-                self.data_table.setCellWidget(row, 2, delete_btn)
-            
-                   # Update stats and chart with chronological data
-                self.update_statistics(chart_data)
-                if chart_data:
-                    self.create_jump_history_chart(chart_data)
-                
+            # Chronological order for the chart; the table shows it reversed
+            jump_data = self.database.jump_history(self.current_user)
         except sqlite3.Error as e:
             print(f"Database error: {e}")
-        finally:
-            conn.close()
+            return
+        
+        self.history_model.load(self.current_user)
+        
+        # Update stats and chart with chronological data
+        self.history_ids = [record_id for record_id, _, _ in jump_data]
+        self.history_heights = [float(height) for _, _, height in jump_data]
+        self.update_statistics()
+        self.history_chart.zoomReset()
+        self.update_history_chart()
+
+    def add_history_records(self, records):
+        """Show newly saved (id, date, height, ts) records without reloading the history"""
+        self.history_model.prepend_records(records)
+        for record_id, date, height, ts in records:
+            self.history_ids.append(record_id)
+            self.history_heights.append(height)
+        self.update_statistics()
+        
+        if len(self.history_heights) <= HISTORY_CHART_MAX_POINTS and not self.history_chart.isZoomed():
+            # Every point is already on the chart, so just append the new ones
+            for record_id, date, height, ts in records:
+                self.history_series.append(self.history_series.count(), height)
+            self.fit_history_axes()
+        else:
+            self.update_history_chart()
 
-    def delete_entry(self, row, record_id):
-        """Delete an entry from the database and refresh the view."""
+    def remove_history_record(self, record_id):
+        """Remove one record's table row and chart point"""
+        self.history_model.remove_record(record_id)
+        
+        index = self.history_ids.index(record_id)
+        del self.history_ids[index]
+        del self.history_heights[index]
+        # Later attempts move one step to the left
+        self.update_history_chart()
+        self.update_statistics()
+
+    def delete_entry(self, record_id):
+        """Delete an entry from the database and remove it from the view."""
         try:
-            conn = sqlite3.connect("users.db")
-            cursor = conn.cursor()
-            cursor.execute("DELETE FROM jump_records WHERE id=?", (record_id,))
-            conn.commit()
-            
-            # Remove the row from the table
-            self.data_table.removeRow(row)
-            
-            # Reload data to update stats and chart
-            self.load_user_data()
-            
+            self.database.delete_jump(record_id)  # Also deletes the stored trajectory
+            self.remove_history_record(record_id)
         except sqlite3.Error as e:
             print(f"Error deleting record: {e}")
-        finally:
-            conn.close()
 
-    def update_statistics(self, jump_data):
-        """Calculate and display jump statistics with proper type handling."""
-        if not jump_data:
-            self.best_jump_label.setText("Best Jump: --")
-            self.average_jump_label.setText("Average Jump: --")
+    def show_stored_trajectory(self, index):
+        """Re-score a saved jump from its stored trajectory, without the video"""
+        record_id = index.data(RECORD_ID_ROLE)
+        
+        try:
+            trajectory = self.database.get_trajectory(record_id)
+        except sqlite3.Error as e:
+            print(f"Database error: {e}")
             return
         
+        if trajectory is None:
+            self.show_message("Jump Details", "No trajectory was saved for this jump.")
+            return
+        
+        from Jump_Analyzer import JumpAnalyzer
+        # Scoring a stored trajectory needs neither a Pose graph nor the athlete's height
+        scorer = JumpAnalyzer(None, pose_graph=False)
+        com_positions, fps, frame_indices, scored_by, _ = trajectory
+        jump_height_meters = scorer.rescore_trajectory(
+            com_positions.tolist(), fps, frame_indices.tolist(), scored_by)
+        rescored = f"{jump_height_meters * 39.37:.1f} inches" if jump_height_meters is not None else "--"
+        self.show_message(
+            "Jump Details",
+            f"Saved height: {index.siblingAtColumn(HEIGHT_COLUMN).data()} inches\n"
+            f"Re-scored height: {rescored}\n"
+            f"{len(com_positions)} pose samples at {fps:.0f} fps"
+        )
+
+    def update_statistics(self):
+        """Display the current user's statistics from the jump_stats summary."""
         try:
-            # Extract and convert heights to float
-            heights = []
-            for record in jump_data:
-                try:
-                    # Handle both (id, date, height) and (date, height) formats
-                    height = float(record[-1])  # Last element is always height
-                    heights.append(height)
-                except (ValueError, IndexError, TypeError):
-                    continue  # Skip invalid entries
-            
-            if heights:
-                best = max(heights)
-                average = sum(heights)/len(heights)
-                self.best_jump_label.setText(f"Best Jump: {best:.1f} inches")
-                self.average_jump_label.setText(f"Average Jump: {average:.1f} inches")
-            else:
-                self.best_jump_label.setText("Best Jump: --")
-                self.average_jump_label.setText("Average Jump: --")
-                
-        except Exception as e:
-            print(f"Error calculating statistics: {e}")
-            self.best_jump_label.setText("Best Jump: Error")
-            self.average_jump_label.setText("Average Jump: Error")
+            count, average, best, recent_best = self.database.jump_stats(self.current_user)
+        except sqlite3.Error as e:
+            print(f"Error loading statistics: {e}")
+            count, average, best, recent_best = 0, None, None, None
+        
+        self.best_jump_label.setText(f"Best Jump: {best:.1f} inches" if best is not None else "Best Jump: --")
+        self.average_jump_label.setText(
+            f"Average Jump: {average:.1f} inches" if average is not None else "Average Jump: --")
+        self.jump_count_label.setText(str(count))
+        self.recent_best_label.setText(f"{recent_best:.1f} inches" if recent_best is not None else "--")
 
     def load_user_height(self):
         """Load and display the user's stored height."""
@@ -889,13 +1208,9 @@ class JumpHeightApp(QWidget):
             return
 
         try:
-            conn = sqlite3.connect("users.db")
-            cursor = conn.cursor()
-            cursor.execute("SELECT height FROM users WHERE email=?", (self.current_user,))
-            result = cursor.fetchone()
+            height = self.database.get_height(self.current_user)
             
-            if result and result[0] is not None:
-                height = result[0]
+            if height is not None:
                 self.height_display.setText(f"{height} inches")
                 if hasattr(self, 'height_input'):
                     self.height_input.setValue(height)
@@ -905,8 +1220,6 @@ class JumpHeightApp(QWidget):
         except (sqlite3.Error, TypeError) as e:
             print(f"Error loading height: {e}")
             self.height_display.setText("Error loading height")
-        finally:
-            conn.close()
 
     def update_user_height(self):
         """Update the user's stored height."""
@@ -922,28 +1235,16 @@ class JumpHeightApp(QWidget):
         
         if ok:
             try:
-                conn = sqlite3.connect("users.db")
-                cursor = conn.cursor()
-                cursor.execute(
-                    "UPDATE users SET height=? WHERE email=?",
-                    (height, self.current_user)
-                )
-                conn.commit()
+                self.database.set_height(self.current_user, height)
                 self.load_user_height()  # Refresh display
             except sqlite3.Error as e:
                 print(f"Error updating height: {e}")
-            finally:
-                conn.close()
 
     def check_and_migrate_user_height(self, email):
         """Ensure existing users have height value."""
-        conn = sqlite3.connect("users.db")
-        cursor = conn.cursor()
         try:
             # Check if user exists and has no height
-            cursor.execute("SELECT height FROM users WHERE email=?", (email,))
-            result = cursor.fetchone()
-            if result and result[0] is None:
+            if self.database.user_exists(email) and self.database.get_height(email) is None:
                 height, ok = QInputDialog.getInt(
                     self,
                     "Height Required",
@@ -951,15 +1252,9 @@ class JumpHeightApp(QWidget):
                     min=48, max=96, value=72
                 )
                 if ok:
-                    cursor.execute(
-                        "UPDATE users SET height=? WHERE email=?",
-                        (height, email)
-                    )
-                    conn.commit()
+                    self.database.set_height(email, height)
         except sqlite3.Error as e:
             print(f"Migration error: {e}")
-        finally:
-            conn.close()
 
     def calculate_vertical(self):
         """Calculate needed vertical jump using either stored or input height."""
@@ -969,11 +1264,7 @@ class JumpHeightApp(QWidget):
                 height_in = self.height_input.value()
             else:
                 # Fallback to database value
-                conn = sqlite3.connect("users.db")
-                cursor = conn.cursor()
-                cursor.execute("SELECT height FROM users WHERE email=?", (self.current_user,))
-                height_in = cursor.fetchone()[0]
-                conn.close()
+                height_in = self.database.get_height(self.current_user)
             
             self.dunk_height = 125
             estimated_reach = round(height_in + 14)
@@ -987,161 +1278,105 @@ class JumpHeightApp(QWidget):
         except Exception as e:
             self.vertical_result_label.setText(f"Error: {str(e)}")
 
-    def process_next_frame(self):
-        ret, frame = self.cap.read()
-        if not ret:
-            self.finish_processing()
-            return
-        
-        # Process frame
-        frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-        results = self.jump_analyzer.pose.process(frame_rgb)
-        
-        # Store COM position if detected
-        if results.pose_landmarks:
-            com_y = self.jump_analyzer.estimate_center_of_mass(
-                results.pose_landmarks.landmark, 
-                frame.shape[0]
-            )
-            if com_y is not None:
-                self.com_positions.append(com_y)
-            
-            # Draw landmarks
-            mp.solutions.drawing_utils.draw_landmarks(
-                frame, results.pose_landmarks, self.jump_analyzer.mp_pose.POSE_CONNECTIONS)
-        
-        # Display frame
-        self.display_frame(frame)
-
     def display_frame(self, frame):
-        """Convert OpenCV frame to QImage and display it"""
-        # Convert color space (BGR → RGB)
-        rgb_image = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-        
-        # Create QImage
-        h, w, ch = rgb_image.shape
-        bytes_per_line = ch * w
-        qt_image = QImage(
-            rgb_image.data, 
-            w, h, 
-            bytes_per_line, 
-            QImage.Format.Format_RGB888
-        )
-        
-        # Scale to fit within the fixed label size while maintaining aspect ratio
-        pixmap = QPixmap.fromImage(qt_image)
-        pixmap = pixmap.scaled(
-            self.video_label.width(),
-            self.video_label.height(),
-            Qt.AspectRatioMode.KeepAspectRatio,
-            Qt.TransformationMode.SmoothTransformation
-        )
-        
-        # Create a new pixmap with black background
-        final_pixmap = QPixmap(self.video_label.size())
-        final_pixmap.fill(Qt.GlobalColor.black)
-        
-        # Center the scaled image on the black background
-        painter = QPainter(final_pixmap)
-        painter.drawPixmap(
-            (final_pixmap.width() - pixmap.width()) // 2,
-            (final_pixmap.height() - pixmap.height()) // 2,
-            pixmap
-        )
-        painter.end()
-        
-        self.video_label.setPixmap(final_pixmap)
+        """Display a letterboxed BGR preview frame"""
+        self.video_label.set_frame(frame)
 
     def toggle_playback(self):
         """Pause/resume video processing"""
-        if self.timer.isActive():
-            self.timer.stop()
-            self.play_pause_button.setText("Resume")
-        else:
-            self.timer.start(30)
-            self.play_pause_button.setText("Pause")
-
-    def process_next_frame(self):
-        ret, frame = self.cap.read()
-        if not ret:
-            self.finish_processing()
+        if self.analysis_worker is None:
             return
-        
-        # Process with MediaPipe
-        results = self.process_frame_with_landmarks(frame)
-        
-        # Display the processed frame
-        self.display_frame(frame)
-        
-        # Update progress
-        #self.update_processing_progress()
+        if self.analysis_worker.is_paused():
+            self.analysis_worker.resume()
+            self.play_pause_button.setText("Pause")
+        else:
+            self.analysis_worker.pause()
+            self.play_pause_button.setText("Resume")
 
-    def update_processing_progress(self):
-        """Update progress bar based on video position"""
-        if hasattr(self, 'cap') and self.cap.isOpened():
-            # Get current frame position and total frames
-            current_frame = int(self.cap.get(cv2.CAP_PROP_POS_FRAMES))
-            total_frames = int(self.cap.get(cv2.CAP_PROP_FRAME_COUNT))
-            
-            # Calculate percentage and update progress bar
-            if total_frames > 0:
-                progress = int((current_frame / total_frames) * 100)
-                self.progress_bar.setValue(progress)
-
-    def process_frame_with_landmarks(self, frame):
-        """Process frame and draw pose landmarks"""
-        frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-        results = self.jump_analyzer.pose.process(frame_rgb)
-        
-        if results.pose_landmarks:
-            # Draw landmarks on original BGR frame
-            mp.solutions.drawing_utils.draw_landmarks(
-                frame,
-                results.pose_landmarks,
-                self.jump_analyzer.mp_pose.POSE_CONNECTIONS,
-                landmark_drawing_spec=mp.solutions.drawing_styles.get_default_pose_landmarks_style()
-            )
-            
-            # Track center of mass
-            com_y = self.jump_analyzer.estimate_center_of_mass(
-                results.pose_landmarks.landmark,
-                frame.shape[0]
-            )
-            if com_y is not None:
-                self.com_positions.append(com_y)
-                # Visualize COM
-                cv2.circle(frame, (frame.shape[1]//2, int(com_y)), 5, (0, 255, 0), -1)
-        
-        return results
+    def update_processing_progress(self, report):
+        """Show a ProgressReport from the worker: percent, analysis fps, ETA and dropped frames"""
+        if report.percent is not None:
+            self.progress_bar.setValue(int(report.percent))
+        parts = ["%p%" if report.percent is not None else f"{report.frames_done} frames"]
+        if report.fps is not None:
+            parts.append(f"{report.fps:.1f} fps")
+        if report.finished:
+            parts.append(f"{report.elapsed_seconds:.1f}s")
+        elif report.eta_seconds is not None:
+            minutes, seconds = divmod(int(math.ceil(report.eta_seconds)), 60)
+            parts.append(f"ETA {minutes}:{seconds:02d}")
+        if report.frames_dropped:
+            parts.append(f"{report.frames_dropped} dropped")
+        if report.frames_skipped:
+            parts.append(f"{report.frames_skipped} skipped after landing")
+        self.progress_bar.setFormat(" · ".join(parts))
     
     def cleanup_video_resources(self):
         """Properly release video resources"""
-        if hasattr(self, 'cap'):
-            self.cap.release()
-        if hasattr(self, 'timer'):
-            self.timer.stop()
+        stopped = self.stop_live_capture()
+        if self.analysis_worker is not None:
+            self.analysis_worker.cancel()
+            stopped = self.analysis_worker.wait(1.0) and stopped
+            self.analysis_worker = None
         self.current_frame = None
+        # Hand the Pose graph back to the pool once no worker thread can be using it;
+        # the analyzer can still score trajectories without it
+        if stopped and self.jump_analyzer is not None:
+            self.jump_analyzer.close()
+
+    def write_analysis_metrics(self):
+        """Export the stage timings of the finished analysis, if they were recorded"""
+        metrics = self.jump_analyzer.metrics if self.jump_analyzer is not None else None
+        self.video_label.metrics = None
+        if metrics is None:
+            return
+        video = os.path.basename(self.current_video_path)
+        try:
+            metrics.write_json(os.path.join(METRICS_DIR, "jump_analysis.json"), video=video)
+            metrics.write_prometheus(os.path.join(METRICS_DIR, "jump_analysis.prom"))
+        except OSError as e:
+            print(f"Could not write metrics: {e}")
 
-    def finish_processing(self):
+    def processing_failed(self, error):
+        print(f"Video processing error: {error}")
+        self.cleanup_video_resources()
+        self.show_error_message()
+
+    def finish_processing(self, com_positions, fps, frame_indices, detected_height=None):
         self.cleanup_video_resources()
         self.progress_bar.setValue(100)
+        self.write_analysis_metrics()
         
         # Check if we have valid data to analyze
-        if not hasattr(self, 'com_positions') or not self.com_positions:
+        if not com_positions:
             print("Error: No valid COM positions data")
             self.show_error_message()
             return
         
+        if self.multi_jump_mode:
+            self.finish_multi_jump(com_positions, fps, frame_indices)
+            return
+        
         try:
-            # Perform jump analysis
-            jump_height_meters, com_data = self.jump_analyzer.analyze_jump(self.current_video_path)
+            if detected_height is not None:
+                # Streaming detector already confirmed the landing
+                jump_height_meters = detected_height
+                scored_by = SCORED_BY_DETECTOR
+            else:
+                scored_by = SCORED_BY_FLIGHT_TIME
+                # Perform jump analysis on the trajectory collected during playback
+                jump_height_meters, com_data = self.jump_analyzer.analyze_trajectory(
+                    com_positions,
+                    fps,
+                    frame_indices
+                )
             
             if jump_height_meters is None:
                 print("Analysis failed - trying fallback method")
                 # Try calculating using COM displacement as fallback
                 if hasattr(self.jump_analyzer, 'pixel_scale') and self.jump_analyzer.pixel_scale:
-                    lowest_com = max(self.com_positions)
-                    highest_com = min(self.com_positions)
+                    lowest_com = max(com_positions)
+                    highest_com = min(com_positions)
                     jump_height_pixels = lowest_com - highest_com
                     jump_height_meters = jump_height_pixels * self.jump_analyzer.pixel_scale
                     jump_height_inches = jump_height_meters * 39.37
@@ -1152,17 +1387,38 @@ class JumpHeightApp(QWidget):
                 jump_height_inches = jump_height_meters * 39.37
             
             # Save and show results if we have valid data
-            self.save_jump_data(jump_height_inches)
+            self.save_jump_data(jump_height_inches, (com_positions, fps, frame_indices, scored_by))
             self.show_results(jump_height_inches)
             
         except Exception as e:
             print(f"Final analysis error: {str(e)}")
             self.show_error_message()
 
+    def finish_multi_jump(self, com_positions, fps, frame_indices):
+        """Save every jump found in a recording of several jumps"""
+        jumps = self.jump_analyzer.segment_jumps(com_positions, fps, frame_indices)
+        if not jumps:
+            print("Error: No jumps found in recording")
+            self.show_error_message()
+            return
+        
+        jump_heights_inches = [jump["jump_height"] * 39.37 for jump in jumps]
+        trajectories = [
+            (com, fps, indices, SCORED_BY_SEGMENTS)
+            for com, indices in slice_trajectories(com_positions, frame_indices, jumps)
+        ]
+        self.save_jump_records(jump_heights_inches, trajectories)
+        
+        heights_text = ", ".join(f"{height:.1f}" for height in jump_heights_inches)
+        self.result_label.setText(f"{len(jumps)} jumps: {heights_text} inches")
+        if self.history_model.rowCount() > 0:
+            self.data_table.selectRow(0)
+        self.video_label.setText("Processing complete")
+
     def show_results(self, jump_height_inches):
         """Display successful results"""
         self.result_label.setText(f"Jump Height: {jump_height_inches:.1f} inches")
-        if self.data_table.rowCount() > 0:
+        if self.history_model.rowCount() > 0:
             self.data_table.selectRow(0)
         self.video_label.setText("Processing complete")
 
@@ -1183,4 +1439,7 @@ if __name__ == '__main__':
     app = QApplication(sys.argv)
     window = JumpHeightApp()
     window.show()
+    # Runs once the event loop has shown the welcome screen
+    QTimer.singleShot(0, lambda: print(
+        f"Startup: welcome screen shown in {time.perf_counter() - STARTUP_TIME:.2f}s"))
     sys.exit(app.exec())
@@ -0,0 +1,294 @@
+import queue
+import threading
+import time
+import cv2
+import mediapipe as mp
+import numpy as np
+from Analysis_Progress import ProgressTracker
+from Jump_Analyzer import JumpDetector
+
+_END_OF_STREAM = object()  # Marks the last item passed between stages
+
+
+class PreviewRenderer:
+    """Letterboxes frames into a few preallocated buffers of the preview size.
+
+    Each frame is resized once, straight into the middle of a black buffer,
+    and the pose overlay is drawn on that small image instead of the full
+    frame. Output stays BGR (QImage.Format_BGR888 displays it as is), so the
+    preview needs no colour conversion. Buffers are reused round-robin, so a
+    buffer is only valid until buffer_count more frames have been rendered.
+    """
+
+    def __init__(self, preview_size=None, buffer_count=3):
+        self.preview_size = preview_size  # (width, height), None for the frame size
+        self.buffer_count = buffer_count
+        self.buffers = []
+        self.next_buffer = 0
+        self.layout = None  # (frame shape, scale, x offset, y offset, width, height)
+
+    def _prepare(self, frame_shape):
+        if self.layout is not None and self.layout[0] == frame_shape:
+            return
+        h, w = frame_shape[:2]
+        target_w, target_h = self.preview_size or (w, h)
+        # Scale to fit the preview while maintaining aspect ratio
+        scale = min(target_w / w, target_h / h)
+        fit_w, fit_h = max(1, int(w * scale)), max(1, int(h * scale))
+        self.layout = (frame_shape, scale, (target_w - fit_w) // 2, (target_h - fit_h) // 2, fit_w, fit_h)
+        self.buffers = [np.zeros((target_h, target_w, 3), dtype=np.uint8) for _ in range(self.buffer_count)]
+
+    def render(self, frame, pose_landmarks=None, com_y=None, pose_connections=None):
+        """Return a letterboxed BGR preview of frame with the pose overlay"""
+        self._prepare(frame.shape)
+        _, scale, x, y, fit_w, fit_h = self.layout
+        buffer = self.buffers[self.next_buffer]
+        self.next_buffer = (self.next_buffer + 1) % self.buffer_count
+
+        view = buffer[y:y + fit_h, x:x + fit_w]
+        if (fit_w, fit_h) == (frame.shape[1], frame.shape[0]):
+            view[...] = frame
+        else:
+            # Bilinear is several times cheaper than INTER_AREA and plenty for a preview
+            cv2.resize(frame, (fit_w, fit_h), dst=view, interpolation=cv2.INTER_LINEAR)
+
+        if pose_landmarks:
+            mp.solutions.drawing_utils.draw_landmarks(
+                view,
+                pose_landmarks,
+                pose_connections,
+                landmark_drawing_spec=mp.solutions.drawing_styles.get_default_pose_landmarks_style()
+            )
+            if com_y is not None:
+                # Visualize COM
+                cv2.circle(view, (fit_w // 2, int(com_y * scale)), 5, (0, 255, 0), -1)
+        return buffer
+
+
+class VideoPipeline:
+    """Decode -> inference -> render pipeline running on worker threads.
+
+    Stages are connected by bounded queues, so a slow stage blocks the ones
+    upstream of it instead of letting frames pile up in memory. Results are
+    reported through plain callbacks that are invoked from the worker threads.
+    With stop_at_landing, decoding stops as soon as the streaming detector
+    confirms a landing and on_finished receives the detected height.
+
+    on_frame receives a letterboxed BGR preview from a small pool of reused
+    buffers. The consumer calls frame_displayed() once it has shown it; until
+    then later frames are not rendered at all, so a slow display costs
+    neither resizing nor overlay drawing and never sees a buffer being reused.
+
+    By default frames are analyzed as fast as the machine allows. preview_rate
+    caps how often (in Hz) a preview is rendered from the most recent frame,
+    independently of the analysis rate; frames in between get no overlay at
+    all. With realtime, decoding is paced at the video's native frame rate
+    so the preview plays back like the video itself.
+
+    on_progress receives a ProgressReport (percent, analysis fps, ETA and
+    frames skipped after the landing) a few times per second rather than
+    once per frame.
+    When the analyzer has metrics attached, decode and render times are
+    recorded next to its own stages.
+    """
+
+    def __init__(self, analyzer, video_path, preview_size=None, queue_size=4, stop_at_landing=False,
+                 preview_rate=None, realtime=False, progress_interval=0.25,
+                 on_frame=None, on_progress=None, on_finished=None, on_error=None):
+        self.analyzer = analyzer
+        self.video_path = video_path
+        self.preview_size = preview_size  # (width, height) of the preview, None for full size
+        self.stop_at_landing = stop_at_landing
+        self.preview_interval = 1.0 / preview_rate if preview_rate else 0.0  # Seconds between previews
+        self.realtime = realtime
+        self.progress_interval = progress_interval
+        self.on_frame = on_frame
+        self.on_progress = on_progress
+        self.on_finished = on_finished
+        self.on_error = on_error
+
+        self.decode_queue = queue.Queue(maxsize=queue_size)
+        self.render_queue = queue.Queue(maxsize=queue_size)
+        self.cancelled = threading.Event()
+        self.landed = threading.Event()  # Set once the detector confirms a landing
+        self.running = threading.Event()  # Cleared while paused
+        self.running.set()
+        self.preview_ready = threading.Event()  # Cleared while a preview frame is being displayed
+        self.preview_ready.set()
+        self.renderer = PreviewRenderer(preview_size)
+        self.threads = []
+        self.detector = None
+        self.progress = None
+        self.metrics = None
+
+        self.fps = 0.0
+        self.total_frames = 0
+        self.com_positions = []
+        self.frame_indices = []
+
+    def start(self):
+        """Open the video and start all stages"""
+        self.cap = cv2.VideoCapture(self.video_path)
+        if not self.cap.isOpened():
+            raise IOError(f"Could not open video: {self.video_path}")
+
+        self.fps = self.cap.get(cv2.CAP_PROP_FPS)
+        self.total_frames = int(self.cap.get(cv2.CAP_PROP_FRAME_COUNT))  # Read once; per-frame queries can be slow
+        self.progress = ProgressTracker(self.total_frames, self.on_progress or (lambda report: None),
+                                        self.progress_interval)
+        if self.stop_at_landing:
+            self.detector = JumpDetector(self.fps, self.analyzer.gravity)
+        self.metrics = self.analyzer.metrics
+        if self.metrics is not None:
+            self.metrics.reset()
+
+        for stage in (self._decode_stage, self._inference_stage, self._render_stage):
+            thread = threading.Thread(target=self._run_stage, args=(stage,), daemon=True)
+            self.threads.append(thread)
+            thread.start()
+
+    def pause(self):
+        self.running.clear()
+
+    def resume(self):
+        self.running.set()
+
+    def is_paused(self):
+        return not self.running.is_set()
+
+    def frame_displayed(self):
+        """Allow the next preview frame to be rendered"""
+        self.preview_ready.set()
+
+    def cancel(self):
+        """Stop all stages as soon as possible; on_finished is not called"""
+        self.cancelled.set()
+        self.running.set()  # Wake a paused decoder so it can exit
+
+    def wait(self, timeout=None):
+        """Join the stages; returns True once they have all exited"""
+        for thread in self.threads:
+            thread.join(timeout)
+        return not any(thread.is_alive() for thread in self.threads)
+
+    def _run_stage(self, stage):
+        try:
+            stage()
+        except Exception as e:
+            self.cancel()
+            if self.on_error:
+                self.on_error(str(e))
+
+    def _put(self, target_queue, item):
+        """Blocking put that gives up when the pipeline is cancelled"""
+        while not self.cancelled.is_set():
+            try:
+                target_queue.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _get(self, source_queue):
+        """Blocking get that returns _END_OF_STREAM when the pipeline is cancelled"""
+        while not self.cancelled.is_set():
+            try:
+                return source_queue.get(timeout=0.1)
+            except queue.Empty:
+                continue
+        return _END_OF_STREAM
+
+    def _decode_stage(self):
+        frame_index = 0
+        frame_interval = 1.0 / self.fps if self.realtime and self.fps > 0 else 0.0
+        next_frame_time = time.perf_counter()
+        try:
+            while not self.cancelled.is_set() and not self.landed.is_set():
+                self.running.wait()
+                if frame_interval:
+                    now = time.perf_counter()
+                    if now - next_frame_time > 0.25:
+                        next_frame_time = now  # Resume from here after a pause or a stall, no catch-up burst
+                    elif next_frame_time > now and self.cancelled.wait(next_frame_time - now):
+                        break
+                    next_frame_time += frame_interval
+                if self.metrics is not None:
+                    start = time.perf_counter()
+                    ret, frame = self.cap.read()
+                    self.metrics.record("decode", time.perf_counter() - start)
+                else:
+                    ret, frame = self.cap.read()
+                if not ret:
+                    break
+                if not self._put(self.decode_queue, (frame_index, frame)):
+                    return
+                frame_index += 1
+        finally:
+            self.cap.release()
+        self._put(self.decode_queue, _END_OF_STREAM)
+
+    def _inference_stage(self):
+        while True:
+            item = self._get(self.decode_queue)
+            if item is _END_OF_STREAM:
+                break
+            frame_index, frame = item
+            if self.landed.is_set():
+                # Drain frames decoded before the decoder saw the landing
+                if not self._put(self.render_queue, (frame_index, None, None, None)):
+                    return
+                continue
+
+            pose_landmarks = self.analyzer.detect_pose(frame)
+            com_y = None
+            if pose_landmarks:
+                com_y = self.analyzer.estimate_center_of_mass(
+                    pose_landmarks.landmark,
+                    frame.shape[0]
+                )
+                if com_y is not None:
+                    self.com_positions.append(com_y)
+                    self.frame_indices.append(frame_index)
+                    if self.detector is not None:
+                        self.detector.update(com_y, frame_index)
+                        if self.detector.landed:
+                            self.landed.set()
+
+            if not self._put(self.render_queue, (frame_index, frame, pose_landmarks, com_y)):
+                return
+        self._put(self.render_queue, _END_OF_STREAM)
+
+    def _render_stage(self):
+        next_preview_time = 0.0
+        while True:
+            item = self._get(self.render_queue)
+            if item is _END_OF_STREAM:
+                break
+
+            frame_index, frame, pose_landmarks, com_y = item
+            if frame is None:
+                self.progress.frame_done(skipped=True)
+                continue
+            if self.on_frame and self.preview_ready.is_set():
+                now = time.perf_counter()
+                if now >= next_preview_time:
+                    next_preview_time = now + self.preview_interval
+                    self.preview_ready.clear()
+                    self.on_frame(self.render_frame(frame, pose_landmarks, com_y))
+            self.progress.frame_done()
+
+        if self.cancelled.is_set():
+            return
+        self.progress.finish()
+        if self.on_finished:
+            jump_height = self.detector.jump_height if self.landed.is_set() else None
+            self.on_finished(self.com_positions, self.fps, self.frame_indices, jump_height)
+
+    def render_frame(self, frame, pose_landmarks, com_y):
+        """Draw the pose overlay and return a BGR image letterboxed to the preview size"""
+        if self.metrics is None:
+            return self.renderer.render(frame, pose_landmarks, com_y, self.analyzer.mp_pose.POSE_CONNECTIONS)
+        start = time.perf_counter()
+        preview = self.renderer.render(frame, pose_landmarks, com_y, self.analyzer.mp_pose.POSE_CONNECTIONS)
+        self.metrics.record("render", time.perf_counter() - start)
+        return preview